@@ -0,0 +1,72 @@
+"""One-off backfill for ledger items written before the date/recency indexes
+
+    cd backend && python backfill_ledger.py
+
+Only items carrying gsi_pk show up in the indexes, so older entries are
+invisible to every date and recency query until this has run. Safe to run
+more than once: existing values are never overwritten.
+
+The all-time summary item is then recomputed from the whole table, since
+entries written before it existed were never added to its totals.
+"""
+from botocore.exceptions import ClientError
+from services.dynamodb import dynamodb_service, GSI_PK, SUMMARY_KEY
+
+
+def _created_at(item: dict) -> str:
+    """Best available creation time for an item that never stored one"""
+    # Older items only have the entry date; midnight UTC keeps the recency
+    # order consistent with it
+    return f"{item['date'][:10]}T00:00:00+00:00"
+
+
+def backfill_index_keys() -> int:
+    """Add gsi_pk/created_at to every entry missing them, return how many changed"""
+    table = dynamodb_service.table
+    scan_kwargs = {
+        'ProjectionExpression': 'transaction_id, #date, gsi_pk, created_at',
+        'ExpressionAttributeNames': {'#date': 'date'}
+    }
+    
+    updated = 0
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            if dynamodb_service._is_reserved(item['transaction_id']):
+                continue
+            if 'gsi_pk' in item and 'created_at' in item:
+                continue
+            try:
+                table.update_item(
+                    Key={'transaction_id': item['transaction_id']},
+                    UpdateExpression=(
+                        "SET gsi_pk = if_not_exists(gsi_pk, :pk), "
+                        "created_at = if_not_exists(created_at, :created)"
+                    ),
+                    # Skip entries deleted since the scan
+                    ConditionExpression='attribute_exists(transaction_id)',
+                    ExpressionAttributeValues={
+                        ':pk': GSI_PK,
+                        ':created': item.get('created_at') or _created_at(item)
+                    }
+                )
+                updated += 1
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return updated
+
+
+def seed_summary() -> dict:
+    """Rebuild the summary item from every existing entry"""
+    return dynamodb_service._rebuild_summary(replace=True)
+
+
+if __name__ == "__main__":
+    count = backfill_index_keys()
+    print(f"Backfilled index keys on {count} entries")
+    summary = seed_summary()
+    print(f"Seeded {SUMMARY_KEY} from {summary['entry_count']} entries, total {summary['total_amount']}")
@@ -22,6 +22,19 @@ class Settings(BaseSettings):
     openrouter_api_key: str = ""
     groq_api_key: str = ""  # For free Whisper transcription
     
+    # Local Whisper (faster-whisper); empty model uses the OpenAI Whisper API
+    whisper_model: str = ""
+    whisper_compute_type: str = "int8"
+    whisper_batch_size: int = 8
+    whisper_cpu_threads: int = 0  # 0 lets CTranslate2 pick
+    whisper_num_workers: int = 1  # parallel transcriptions sharing the model
+    
+    # Cap on concurrent in-flight OpenAI requests per service
+    openai_max_concurrency: int = 10
+    # Retries (with exponential backoff) on 429/5xx/timeouts, and per-request timeout
+    openai_max_retries: int = 2
+    openai_timeout: float = 60.0
+    
     # App
     confidence_threshold: float = 0.85
     debug: bool = False
@@ -35,3 +48,11 @@ class Settings(BaseSettings):
 def get_settings() -> Settings:
     """Get cached settings instance"""
     return Settings()
+
+
+# Plain module constants for values read on per-request paths
+_settings = get_settings()
+CONFIDENCE_THRESHOLD = _settings.confidence_threshold
+AWS_REGION = _settings.aws_region
+S3_BUCKET = _settings.s3_bucket_name
+DDB_TABLE = _settings.dynamodb_table_name
@@ -0,0 +1,34 @@
+"""Gunicorn settings for multi-worker production runs
+
+    gunicorn main:app -c gunicorn.conf.py
+
+The app (specs, keyword automaton, AWS and OpenAI clients) is imported once
+in the master and forked into the workers. gc is paused until the fork and
+the imported objects are frozen, so collections in the workers don't touch
+their refcounts and the pages stay shared copy-on-write.
+
+The local Whisper model is still loaded per worker at startup: CTranslate2's
+thread pool does not survive a fork. To share one model between concurrent
+requests, run fewer workers with a higher WHISPER_NUM_WORKERS instead.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# No collections in the master while the app is imported, so nothing is
+# moved between generations (and its pages written) before the fork
+gc.disable()
+
+
+def when_ready(server):
+    """Runs in the master once the app is imported, before any worker forks."""
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Workers collect as usual; frozen objects are never scanned."""
+    gc.enable()
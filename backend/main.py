@@ -1,29 +1,52 @@
 """FinGuru Backend API - Main Application"""
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from routers import receipts, voice, ledger, advisor, auth
 from config import get_settings
 
 settings = get_settings()
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Startup and shutdown events."""
-    # Startup: Preload Whisper model
-    print("Starting FinGuru API...")
+async def _preload_whisper():
+    """Load the Whisper model off the event loop so startup isn't blocked."""
     try:
         from services.transcribe import preload_model
-        preload_model()
+        await asyncio.to_thread(preload_model)
     except Exception as e:
         print(f"Warning: Whisper model preload failed: {e}")
         print("Voice transcription will attempt to load model on first request.")
+
+
+async def _prewarm_users_table():
+    """Resolve (or create) the users table before the first login needs it."""
+    try:
+        from services.auth import get_users_table
+        await asyncio.to_thread(get_users_table)
+    except Exception as e:
+        print(f"Warning: users table warmup failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup and shutdown events."""
+    # Startup: Preload Whisper model and the users table in the background
+    # and start serving now (the reasoning engine is built at import)
+    print("Starting FinGuru API...")
+    warmup_tasks = [
+        asyncio.create_task(_preload_whisper()),
+        asyncio.create_task(_prewarm_users_table())
+    ]
     
     yield
     
     # Shutdown
     print("Shutting down FinGuru API...")
+    await asyncio.gather(*warmup_tasks)
+    from services.dynamodb import entry_batcher
+    await entry_batcher.close()
 
 
 app = FastAPI(
@@ -32,6 +55,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -65,11 +89,13 @@ async def root():
 @app.get("/health")
 async def health():
     """Detailed health check"""
-    # Check if OpenAI Whisper API is configured
+    # Check if local Whisper or the OpenAI Whisper API is configured
     whisper_status = "not_configured"
     try:
-        from services.transcribe import client
-        if client is not None:
+        from services.transcribe import transcribe_service
+        if transcribe_service.model is not None:
+            whisper_status = "local_ready"
+        elif transcribe_service.client is not None:
             whisper_status = "api_ready"
     except:
         pass
@@ -1,13 +1,18 @@
 """Pydantic models for FinGuru API"""
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, Literal
 from pydantic import BaseModel, Field
 from uuid import uuid4
 
 
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
 class LedgerEntry(BaseModel):
     """Core ledger entry model - strict schema"""
-    transaction_id: str = Field(default_factory=lambda: str(uuid4()))
+    transaction_id: str = Field(default_factory=lambda: uuid4().hex)
     date: str = Field(..., description="ISO format date")
     amount: float = Field(..., gt=0, description="Amount in INR")
     category: str = Field(..., description="Expense category")
@@ -21,7 +26,7 @@ class LedgerEntry(BaseModel):
     receipt_url: Optional[str] = None
     audio_url: Optional[str] = None
     raw_text: Optional[str] = None
-    created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = Field(default_factory=_now_iso)
 
 
 class ReceiptExtraction(BaseModel):
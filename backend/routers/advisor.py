@@ -1,6 +1,9 @@
 """CA Advisor API - Summarizes expenses and provides insights"""
+import time
 from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from services.dynamodb import dynamodb_service
 
@@ -20,16 +23,50 @@ class AdvisorInsight(BaseModel):
     category_breakdown: dict[str, float]
 
 
+# Display names for ledger categories
+CATEGORY_DISPLAY = {
+    "food": "Food & Beverages",
+    "transport": "Transportation",
+    "office_supplies": "Office Supplies",
+    "utilities": "Utilities",
+    "rent": "Rent & Lease",
+    "professional_services": "Professional Services",
+    "raw_materials": "Raw Materials",
+    "maintenance": "Repairs & Maintenance",
+    "miscellaneous": "Miscellaneous"
+}
+
+# Insights are recomputed only when the ledger changes or the entry goes stale
+INSIGHTS_CACHE_TTL = 30  # seconds
+_insights_cache: Optional[tuple[int, float, AdvisorInsight]] = None
+
+
 @router.get("/insights", response_model=AdvisorInsight)
 async def get_insights():
     """
     Get CA-style insights and summary of all expenses.
     Acts as your personal accountant companion.
     """
-    # Get all entries
-    entries = dynamodb_service.get_recent_entries(100)
+    global _insights_cache
     
-    if not entries:
+    version = dynamodb_service.ledger_version
+    if _insights_cache is not None:
+        cached_version, cached_at, cached_insight = _insights_cache
+        if cached_version == version and time.monotonic() - cached_at < INSIGHTS_CACHE_TTL:
+            return cached_insight
+    
+    insight = await run_in_threadpool(_compute_insights)
+    _insights_cache = (version, time.monotonic(), insight)
+    return insight
+
+
+def _compute_insights() -> AdvisorInsight:
+    """Build an AdvisorInsight from the ledger's running totals."""
+    # Point read of the running totals kept by the DynamoDB service
+    ledger_summary = dynamodb_service.get_summary()
+    entry_count = ledger_summary['entry_count']
+    
+    if not entry_count:
         return AdvisorInsight(
             summary="No expenses recorded yet. Start by uploading a receipt or recording a voice expense!",
             total_expenses=0,
@@ -42,17 +79,10 @@ async def get_insights():
             category_breakdown={}
         )
     
-    # Calculate totals
-    total_expenses = sum(e.amount for e in entries)
-    total_gst = sum(e.gst_amount for e in entries)
-    
-    # Category breakdown
-    category_totals = {}
-    gst_by_category = {}
-    for entry in entries:
-        cat = entry.category
-        category_totals[cat] = category_totals.get(cat, 0) + entry.amount
-        gst_by_category[cat] = gst_by_category.get(cat, 0) + entry.gst_amount
+    total_expenses = ledger_summary['total_amount']
+    total_gst = ledger_summary['total_gst']
+    category_totals = ledger_summary['by_category']
+    gst_by_category = ledger_summary['gst_by_category']
     
     # Find top category
     top_category = max(category_totals, key=category_totals.get) if category_totals else "None"
@@ -62,40 +92,29 @@ async def get_insights():
     summary = _generate_summary(
         total_expenses=total_expenses,
         total_gst=total_gst,
-        entry_count=len(entries),
+        entry_count=entry_count,
         top_category=top_category,
         top_category_amount=top_category_amount,
         category_totals=category_totals
     )
     
-    # Generate tips
+    # Generate tips from the precomputed totals
     tips = _generate_tips(
         total_expenses=total_expenses,
         total_gst=total_gst,
         category_totals=category_totals,
-        entries=entries
+        top_category=top_category,
+        top_category_amount=top_category_amount
     )
     
     # Format category names for display
-    category_display = {
-        "food": "Food & Beverages",
-        "transport": "Transportation", 
-        "office_supplies": "Office Supplies",
-        "utilities": "Utilities",
-        "rent": "Rent & Lease",
-        "professional_services": "Professional Services",
-        "raw_materials": "Raw Materials",
-        "maintenance": "Repairs & Maintenance",
-        "miscellaneous": "Miscellaneous"
-    }
-    
     formatted_categories = {
-        category_display.get(k, k): round(v, 2) 
+        CATEGORY_DISPLAY.get(k, k): round(v, 2) 
         for k, v in category_totals.items()
     }
     
     formatted_gst = {
-        category_display.get(k, k): round(v, 2)
+        CATEGORY_DISPLAY.get(k, k): round(v, 2)
         for k, v in gst_by_category.items()
     }
     
@@ -103,9 +122,9 @@ async def get_insights():
         summary=summary,
         total_expenses=round(total_expenses, 2),
         total_gst=round(total_gst, 2),
-        top_category=category_display.get(top_category, top_category),
+        top_category=CATEGORY_DISPLAY.get(top_category, top_category),
         top_category_amount=round(top_category_amount, 2),
-        entry_count=len(entries),
+        entry_count=entry_count,
         tips=tips,
         gst_breakdown=formatted_gst,
         category_breakdown=formatted_categories
@@ -122,37 +141,34 @@ def _generate_summary(
 ) -> str:
     """Generate a CA-style summary paragraph."""
     
-    category_display = {
-        "food": "Food & Beverages",
-        "transport": "Transportation",
-        "office_supplies": "Office Supplies", 
-        "utilities": "Utilities",
-        "raw_materials": "Raw Materials",
-        "maintenance": "Repairs & Maintenance",
-        "miscellaneous": "Miscellaneous"
-    }
-    
-    top_cat_display = category_display.get(top_category, top_category)
+    top_cat_display = CATEGORY_DISPLAY.get(top_category, top_category)
     top_percentage = (top_category_amount / total_expenses * 100) if total_expenses > 0 else 0
     gst_percentage = (total_gst / total_expenses * 100) if total_expenses > 0 else 0
     
-    summary = f"You have recorded {entry_count} expense{'s' if entry_count != 1 else ''} "
-    summary += f"totaling ₹{total_expenses:,.2f}. "
-    summary += f"Your GST liability stands at ₹{total_gst:,.2f} ({gst_percentage:.1f}% of total). "
-    summary += f"Your highest spending category is {top_cat_display} at ₹{top_category_amount:,.2f} "
-    summary += f"({top_percentage:.1f}% of expenses). "
-    
-    if len(category_totals) > 1:
-        summary += f"Your expenses are spread across {len(category_totals)} categories."
-    
-    return summary
+    return (
+        "You have recorded {n} expense{s} totaling ₹{te:,.2f}. "
+        "Your GST liability stands at ₹{tg:,.2f} ({gp:.1f}% of total). "
+        "Your highest spending category is {tc} at ₹{ta:,.2f} ({tp:.1f}% of expenses). "
+        "{extra}"
+    ).format(
+        n=entry_count,
+        s="" if entry_count == 1 else "s",
+        te=total_expenses,
+        tg=total_gst,
+        gp=gst_percentage,
+        tc=top_cat_display,
+        ta=top_category_amount,
+        tp=top_percentage,
+        extra=f"Your expenses are spread across {len(category_totals)} categories." if len(category_totals) > 1 else ""
+    )
 
 
 def _generate_tips(
     total_expenses: float,
     total_gst: float,
     category_totals: dict,
-    entries: list
+    top_category: str,
+    top_category_amount: float
 ) -> list[str]:
     """Generate actionable CA-style tips."""
     
@@ -163,17 +179,15 @@ def _generate_tips(
         tips.append(f"💡 You have ₹{total_gst:,.2f} in GST. If you're GST registered, you can claim Input Tax Credit on eligible business expenses.")
     
     # High spending category tip
-    if category_totals:
-        top_cat = max(category_totals, key=category_totals.get)
-        if category_totals[top_cat] > total_expenses * 0.5:
-            tips.append(f"📊 Over 50% of your expenses are in one category. Consider reviewing if all these expenses are necessary.")
+    if top_category_amount > total_expenses * 0.5:
+        tips.append(f"📊 Over 50% of your expenses are in one category. Consider reviewing if all these expenses are necessary.")
     
     # Raw materials tip
-    if "raw_materials" in category_totals and category_totals["raw_materials"] > 5000:
+    if category_totals.get("raw_materials", 0.0) > 5000:
         tips.append("🏭 Significant raw material expenses detected. Ensure you're getting GST invoices from registered vendors for ITC claims.")
     
     # Food expenses tip
-    if "food" in category_totals and category_totals["food"] > 2000:
+    if category_totals.get("food", 0.0) > 2000:
         tips.append("🍽️ Food expenses are generally not eligible for Input Tax Credit unless for business meetings/events.")
     
     # Transport tip
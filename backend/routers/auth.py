@@ -1,4 +1,5 @@
 """Authentication Router"""
+import re
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, EmailStr
 from services.auth import register_user, authenticate_user, create_token, get_current_user
@@ -6,6 +7,9 @@ from fastapi import Depends
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Cheap shape check for login; registration keeps full EmailStr validation
+_EMAIL_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+
 
 class RegisterRequest(BaseModel):
     email: EmailStr
@@ -14,7 +18,7 @@ class RegisterRequest(BaseModel):
 
 
 class LoginRequest(BaseModel):
-    email: EmailStr
+    email: str
     password: str
 
 
@@ -39,6 +43,9 @@ async def register(req: RegisterRequest):
 @router.post("/login", response_model=AuthResponse)
 async def login(req: LoginRequest):
     """Login and get token"""
+    if not _EMAIL_RE.fullmatch(req.email):
+        raise HTTPException(status_code=400, detail="Invalid email")
+    
     user = authenticate_user(req.email, req.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
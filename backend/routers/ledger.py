@@ -1,9 +1,14 @@
 """Ledger CRUD and summary API"""
+import asyncio
 from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
-from models.schemas import LedgerEntry, DailySummary
+from fastapi.concurrency import run_in_threadpool
+from models.schemas import LedgerEntry, DailySummary, ReasoningInput
 from services.dynamodb import dynamodb_service
+from services.reasoning import reasoning_engine, CATEGORIES_LIST, CATEGORY_GST_RATE
+from services.batch import batch_service
+from services.s3 import s3_service
 
 router = APIRouter(prefix="/ledger", tags=["ledger"])
 
@@ -15,26 +20,26 @@ async def get_entries(
 ):
     """Get ledger entries, optionally filtered by date."""
     if date:
-        entries = dynamodb_service.get_entries_by_date(date)
+        entries = await run_in_threadpool(dynamodb_service.get_entries_by_date, date)
     else:
-        entries = dynamodb_service.get_recent_entries(limit)
+        entries = await run_in_threadpool(dynamodb_service.get_recent_entries, limit)
     
-    return entries
+    return [_with_view_urls(entry) for entry in entries]
 
 
 @router.get("/entries/{transaction_id}", response_model=LedgerEntry)
 async def get_entry(transaction_id: str):
     """Get single ledger entry by ID."""
-    entry = dynamodb_service.get_entry(transaction_id)
+    entry = await run_in_threadpool(dynamodb_service.get_entry, transaction_id)
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
-    return entry
+    return _with_view_urls(entry)
 
 
 @router.delete("/entries/{transaction_id}")
 async def delete_entry(transaction_id: str):
     """Delete a ledger entry."""
-    success = dynamodb_service.delete_entry(transaction_id)
+    success = await run_in_threadpool(dynamodb_service.delete_entry, transaction_id)
     if not success:
         raise HTTPException(status_code=404, detail="Entry not found or could not be deleted")
     return {"success": True, "message": "Entry deleted"}
@@ -55,7 +60,7 @@ async def get_daily_summary(
     if date is None:
         date = datetime.utcnow().strftime('%Y-%m-%d')
     
-    summary = dynamodb_service.get_daily_summary(date)
+    summary = await run_in_threadpool(dynamodb_service.get_daily_summary, date)
     return summary
 
 
@@ -65,45 +70,135 @@ async def get_range_summary(
     end_date: str = Query(..., description="End date (YYYY-MM-DD)")
 ):
     """Get summary for a date range."""
-    entries = dynamodb_service.get_entries_range(start_date, end_date)
-    
-    total_amount = sum(e.amount for e in entries)
-    total_gst = sum(e.gst_amount for e in entries)
-    
-    by_category = {}
-    gst_by_category = {}
-    by_source = {"receipt": 0, "voice": 0}
-    
-    for entry in entries:
-        cat = entry.category
-        by_category[cat] = by_category.get(cat, 0) + entry.amount
-        gst_by_category[cat] = gst_by_category.get(cat, 0) + entry.gst_amount
-        by_source[entry.source] = by_source.get(entry.source, 0) + entry.amount
+    summary = await run_in_threadpool(dynamodb_service.get_range_summary, start_date, end_date)
     
     return {
         "start_date": start_date,
         "end_date": end_date,
-        "total_amount": round(total_amount, 2),
-        "total_gst": round(total_gst, 2),
-        "entry_count": len(entries),
-        "by_category": {k: round(v, 2) for k, v in by_category.items()},
-        "gst_by_category": {k: round(v, 2) for k, v in gst_by_category.items()},
-        "by_source": by_source
+        **summary
     }
 
 
 @router.get("/categories")
 async def get_categories():
     """Get available expense categories with GST rates."""
-    from services.reasoning import reasoning_engine
-    specs = reasoning_engine.specs
+    return CATEGORIES_LIST
+
+
+@router.post("/recategorize")
+async def recategorize_entries(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    batch: bool = Query(True, description="Queue on the OpenAI Batch API instead of running now")
+):
+    """
+    Re-run the reasoning engine over existing entries, e.g. after a spec change.
+    
+    With batch=true the work goes to the Batch API (half price, done within
+    24h); apply it later via /ledger/recategorize/{batch_id}. Otherwise, when
+    only OpenRouter is configured, or if submission fails, entries are
+    processed right away.
+    """
+    entries = await run_in_threadpool(dynamodb_service.get_entries_range, start_date, end_date)
+    entries = {e.transaction_id: e for e in entries if e.raw_text and e.confidence < 1.0}
+    if not entries:
+        return {"status": "completed", "entry_count": 0, "updated": 0}
+    
+    if batch and batch_service.enabled:
+        try:
+            batch_id = await batch_service.submit_categorization_batch(
+                {tid: _entry_input(e) for tid, e in entries.items()}
+            )
+            return {"status": "submitted", "batch_id": batch_id, "entry_count": len(entries)}
+        except Exception as e:
+            # Fall back to processing the entries right away
+            print(f"Batch submission failed (processing online): {e}")
     
-    categories = []
-    for key, data in specs['categories'].items():
-        categories.append({
-            "key": key,
-            "display_name": data.get('display_name', key),
-            "gst_rate": data.get('gst_rate', 18)
-        })
+    # One batched classification request per chunk of entries rather than
+    # a full reasoning call each
+    categories = await reasoning_engine.categorize_batch([e.raw_text for e in entries.values()])
+    results = {
+        tid: (category, confidence, f"Re-categorized as {category} in a bulk re-run.")
+        for tid, (category, confidence) in zip(entries, categories)
+    }
+    updated = await _apply_categories(entries, results)
+    return {"status": "completed", "entry_count": len(entries), "updated": updated}
+
+
+@router.post("/recategorize/{batch_id}")
+async def apply_recategorize_batch(batch_id: str):
+    """Apply a finished recategorization batch to the ledger."""
+    try:
+        results = await batch_service.get_batch_results(batch_id)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if results is None:
+        return {"status": "in_progress", "batch_id": batch_id}
     
-    return categories
+    entries = await asyncio.gather(
+        *(run_in_threadpool(dynamodb_service.get_entry, tid) for tid in results)
+    )
+    entries = {e.transaction_id: e for e in entries if e and e.confidence < 1.0}
+    outputs = {
+        tid: reasoning_engine.to_output(results[tid], _entry_input(e))
+        for tid, e in entries.items()
+    }
+    updated = await _apply_categories(entries, {
+        tid: (output.category, output.confidence, output.explanation)
+        for tid, output in outputs.items()
+    })
+    return {"status": "completed", "batch_id": batch_id, "updated": updated}
+
+
+def _with_view_urls(entry: LedgerEntry) -> LedgerEntry:
+    """Swap stored s3:// receipt/audio locations for presigned view URLs."""
+    # Signing is local and cached, so it runs on the event loop, which also
+    # keeps the presigned URL cache single-threaded
+    urls = {
+        field: s3_service.get_presigned_url(value)
+        for field in ('receipt_url', 'audio_url')
+        if (value := getattr(entry, field)) and value.startswith("s3://")
+    }
+    return entry.model_copy(update=urls) if urls else entry
+
+
+def _entry_input(entry: LedgerEntry) -> ReasoningInput:
+    """Rebuild the reasoning input for a stored entry."""
+    return ReasoningInput(
+        source=entry.source,
+        extracted_text=entry.raw_text,
+        extracted_amount=entry.amount,
+        extracted_date=entry.date,
+        extracted_vendor=entry.vendor_name,
+        extracted_gstin=entry.vendor_gstin
+    )
+
+
+async def _apply_categories(
+    entries: dict[str, LedgerEntry],
+    results: dict[str, tuple[str, float, str]]
+) -> int:
+    """Write new (category, confidence, explanation) back, keeping stored amounts."""
+    updated = 0
+    for tid, (category, confidence, explanation) in results.items():
+        entry = entries[tid]
+        gst_rate = CATEGORY_GST_RATE.get(category, 18)
+        if category == entry.category and gst_rate == entry.gst_rate:
+            continue
+        
+        # Skip entries the user confirmed in the meantime
+        result = await run_in_threadpool(
+            dynamodb_service.update_entry,
+            tid,
+            {
+                'category': category,
+                'gst_rate': gst_rate,
+                'gst_amount': round(entry.amount * gst_rate / 100, 2),
+                'confidence': confidence,
+                'explanation': explanation
+            },
+            {'confidence': entry.confidence}
+        )
+        if result:
+            updated += 1
+    return updated
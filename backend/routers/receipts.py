@@ -1,15 +1,30 @@
 """Receipt upload and processing API"""
 from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from models.schemas import (
     LedgerEntry, UploadResponse, ReasoningInput, ConfirmationRequest
 )
-from services.textract import textract_service
-from services.reasoning import reasoning_engine
-from services.dynamodb import dynamodb_service
+from services.textract import textract_service, ReceiptTooLongError
+from services.reasoning import reasoning_engine, CATEGORY_GST_RATE
+from services.dynamodb import dynamodb_service, entry_batcher
 
 router = APIRouter(prefix="/receipts", tags=["receipts"])
 
+ALLOWED_IMAGE_TYPES = frozenset({'image/jpeg', 'image/png', 'image/webp', 'image/jpg'})
+
+
+def _sniff_image_type(header: bytes) -> Optional[str]:
+    """Detect image content type from the file's magic bytes"""
+    if header.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
 
 @router.post("/upload", response_model=UploadResponse)
 async def upload_receipt(file: UploadFile = File(...)):
@@ -20,23 +35,25 @@ async def upload_receipt(file: UploadFile = File(...)):
     1. Validate file type
     2. Extract text via Vision API
     3. Process through reasoning engine
-    4. Store in DynamoDB (if confident)
+    4. Store in DynamoDB
     5. Return result with explanation
     """
-    # Validate file type
-    allowed_types = ['image/jpeg', 'image/png', 'image/webp', 'image/jpg']
-    if file.content_type not in allowed_types:
+    # Validate file type from magic bytes rather than the client header
+    header = await file.read(12)
+    await file.seek(0)
+    content_type = _sniff_image_type(header)
+    if content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid file type. Allowed: {allowed_types}"
+            detail=f"Invalid file type. Allowed: {sorted(ALLOWED_IMAGE_TYPES)}"
         )
     
     try:
-        # Read file content
-        content = await file.read()
-        
-        # Extract text via Vision API
-        extraction = textract_service.extract_receipt(content)
+        # Extract text via Vision API straight from the spooled upload file
+        try:
+            extraction = await textract_service.extract_receipt(file.file, content_type)
+        except ReceiptTooLongError as e:
+            return UploadResponse(success=False, error=str(e))
         
         if not extraction.raw_text or extraction.confidence == 0:
             return UploadResponse(
@@ -55,7 +72,7 @@ async def upload_receipt(file: UploadFile = File(...)):
         )
         
         # Process through reasoning engine
-        reasoning_output = reasoning_engine.process(reasoning_input)
+        reasoning_output = await reasoning_engine.process(reasoning_input)
         
         # Create ledger entry
         ledger_entry = LedgerEntry(
@@ -72,8 +89,16 @@ async def upload_receipt(file: UploadFile = File(...)):
             raw_text=extraction.raw_text
         )
         
-        # Always save to DynamoDB (even if needs confirmation)
-        dynamodb_service.save_entry(ledger_entry)
+        # Always save to DynamoDB (even if needs confirmation). The entry is
+        # stored before it is returned, so a confirm can never arrive first
+        try:
+            await entry_batcher.save(ledger_entry)
+        except Exception as e:
+            print(f"DynamoDB save failed: {e}")
+            return UploadResponse(
+                success=False,
+                error="Could not save the entry. Please try again."
+            )
         
         return UploadResponse(
             success=True,
@@ -93,34 +118,20 @@ async def upload_receipt(file: UploadFile = File(...)):
 async def confirm_receipt(request: ConfirmationRequest):
     """Confirm or correct a low-confidence receipt entry."""
     try:
-        # Get existing entry
-        entry = dynamodb_service.get_entry(request.transaction_id)
-        if not entry:
-            raise HTTPException(status_code=404, detail="Entry not found")
-        
-        # Apply corrections
-        updates = {}
-        if request.confirmed_amount is not None:
-            updates['amount'] = request.confirmed_amount
-            updates['gst_amount'] = round(request.confirmed_amount * entry.gst_rate / 100, 2)
-        
+        # New GST rate from specs if the category changed
+        gst_rate = None
         if request.confirmed_category is not None:
-            updates['category'] = request.confirmed_category
-            from services.reasoning import reasoning_engine
-            specs = reasoning_engine.specs
-            new_gst_rate = specs['categories'].get(request.confirmed_category, {}).get('gst_rate', 18)
-            updates['gst_rate'] = new_gst_rate
-            amount = request.confirmed_amount or entry.amount
-            updates['gst_amount'] = round(amount * new_gst_rate / 100, 2)
+            gst_rate = CATEGORY_GST_RATE.get(request.confirmed_category, 18)
         
-        updates['confidence'] = 1.0
-        updates['explanation'] = entry.explanation + " [User confirmed]"
-        
-        if updates:
-            updated_entry = dynamodb_service.update_entry(request.transaction_id, updates)
-        else:
-            dynamodb_service.save_entry(entry)
-            updated_entry = entry
+        updated_entry = await run_in_threadpool(
+            dynamodb_service.confirm_entry,
+            request.transaction_id,
+            request.confirmed_amount,
+            request.confirmed_category,
+            gst_rate
+        )
+        if not updated_entry:
+            raise HTTPException(status_code=404, detail="Entry not found")
         
         return UploadResponse(
             success=True,
@@ -1,24 +1,54 @@
 """Voice upload and processing API using Local Whisper"""
+import asyncio
+import os
 from datetime import datetime
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from botocore.exceptions import ClientError
 from pydantic import BaseModel
-from typing import Optional
+from typing import BinaryIO, Optional
 from models.schemas import (
-    LedgerEntry, UploadResponse, ReasoningInput, ConfirmationRequest
+    LedgerEntry, UploadResponse, ReasoningInput, ReasoningOutput, ConfirmationRequest
 )
-from services.transcribe import transcribe_service
-from services.reasoning import reasoning_engine
-from services.dynamodb import dynamodb_service
+from services.transcribe import transcribe_service, model_ready
+from services.reasoning import reasoning_engine, CATEGORY_GST_RATE
+from services.dynamodb import dynamodb_service, entry_batcher
 from services.s3 import s3_service
 
 router = APIRouter(prefix="/voice", tags=["voice"])
 
+# How long a request waits for the startup model preload before going ahead
+MODEL_READY_TIMEOUT = 60  # seconds
+
+# Lifetime of a presigned direct-to-S3 upload URL
+PRESIGNED_UPLOAD_TTL = 300  # seconds
+
+# Recordings smaller than this are treated as accidental taps
+MIN_AUDIO_BYTES = 1000
+
+ALLOWED_AUDIO_TYPES = frozenset({
+    'audio/webm', 'audio/mp3', 'audio/mpeg', 'audio/wav',
+    'audio/ogg', 'audio/mp4', 'audio/x-m4a', 'audio/m4a',
+    'audio/flac', 'audio/aac', 'video/webm'
+})
+
 
 class TextInput(BaseModel):
     """Input for text-based voice processing (browser speech recognition)."""
     text: str
 
 
+class VoiceInitRequest(BaseModel):
+    """Request for a presigned direct-to-S3 audio upload."""
+    content_type: str = 'audio/webm'
+
+
+class VoiceS3Upload(BaseModel):
+    """Audio already uploaded to S3 through a presigned URL."""
+    s3_key: str
+    filename: Optional[str] = None
+
+
 @router.post("/upload", response_model=UploadResponse)
 async def upload_voice(file: UploadFile = File(...)):
     """
@@ -32,49 +62,97 @@ async def upload_voice(file: UploadFile = File(...)):
     5. Store in DynamoDB
     6. Return result with explanation
     """
-    # Validate file type
-    allowed_types = [
-        'audio/webm', 'audio/mp3', 'audio/mpeg', 'audio/wav', 
-        'audio/ogg', 'audio/mp4', 'audio/x-m4a', 'audio/m4a',
-        'audio/flac', 'audio/aac', 'video/webm'
-    ]
     content_type = file.content_type or 'audio/webm'
     
     try:
-        # Read file content
-        content = await file.read()
+        # Size the spooled upload without reading it into memory
+        file.file.seek(0, os.SEEK_END)
+        size = file.file.tell()
+        file.file.seek(0)
         
-        if len(content) < 1000:
+        if size < MIN_AUDIO_BYTES:
             return UploadResponse(
                 success=False,
                 error="Recording too short. Please try again with a longer recording."
             )
         
-        # Step 1: Save audio to S3
+        # Step 1: Stream audio to S3
         audio_url = None
         try:
-            audio_url = s3_service.upload_audio(content, content_type)
+            audio_url = await run_in_threadpool(s3_service.upload_stream, file.file, content_type)
         except Exception as e:
             print(f"S3 upload failed (continuing without): {e}")
+        file.file.seek(0)
         
-        # Step 2: Transcribe audio using local Whisper
-        transcription = transcribe_service.transcribe_audio(
-            content, 
-            file.filename or "audio.webm"
+        # Steps 2-3: Transcribe and process through reasoning engine
+        return await _transcribe_and_process(
+            file.file,
+            file.filename or "audio.webm",
+            audio_url
         )
         
-        if not transcription.raw_text:
+    except Exception as e:
+        print(f"Voice upload error: {e}")
+        return UploadResponse(
+            success=False,
+            error=f"Processing failed: {str(e)}"
+        )
+
+
+@router.post("/init")
+async def init_voice_upload(request: VoiceInitRequest):
+    """
+    Start a direct-to-S3 voice upload.
+    
+    The client PUTs the recording to the returned URL (with the same
+    Content-Type), then calls /voice/upload-s3 with the returned key, so
+    the audio bytes never pass through the API server on the way in.
+    """
+    if request.content_type not in ALLOWED_AUDIO_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported audio type")
+    
+    upload = await run_in_threadpool(
+        s3_service.create_upload_url, request.content_type, "audio", PRESIGNED_UPLOAD_TTL
+    )
+    return {
+        "upload_url": upload["url"],
+        "s3_key": upload["key"],
+        "content_type": request.content_type,
+        "expires_in": PRESIGNED_UPLOAD_TTL
+    }
+
+
+@router.post("/upload-s3", response_model=UploadResponse)
+async def upload_voice_from_s3(request: VoiceS3Upload):
+    """Process a voice recording uploaded to S3 via /voice/init."""
+    # Only keys handed out by /voice/init are accepted
+    if not request.s3_key.startswith("audio/") or ".." in request.s3_key:
+        raise HTTPException(status_code=400, detail="Invalid audio key")
+    
+    try:
+        try:
+            size = await run_in_threadpool(s3_service.get_object_size, request.s3_key)
+        except ClientError:
+            return UploadResponse(
+                success=False,
+                error="Audio not found. Please upload the recording first."
+            )
+        
+        if size < MIN_AUDIO_BYTES:
             return UploadResponse(
                 success=False,
-                error="Could not transcribe audio. Please speak clearly and try again."
+                error="Recording too short. Please try again with a longer recording."
             )
         
-        # Step 3: Process through reasoning engine
-        return await _process_transcription(
-            text=transcription.raw_text,
-            transcription_confidence=transcription.confidence,
-            audio_url=audio_url
-        )
+        audio_file = await run_in_threadpool(s3_service.download_stream, request.s3_key)
+        try:
+            return await _transcribe_and_process(
+                audio_file,
+                request.filename or os.path.basename(request.s3_key),
+                f"s3://{s3_service.bucket}/{request.s3_key}"
+            )
+        finally:
+            audio_file.close()
         
     except Exception as e:
         print(f"Voice upload error: {e}")
@@ -84,6 +162,36 @@ async def upload_voice(file: UploadFile = File(...)):
         )
 
 
+async def _transcribe_and_process(
+    audio_file: BinaryIO,
+    filename: str,
+    audio_url: Optional[str]
+) -> UploadResponse:
+    """Transcribe a recording and run the text through the reasoning pipeline."""
+    # Transcribe audio using local Whisper (once preload is done)
+    if not model_ready.is_set():
+        await asyncio.to_thread(model_ready.wait, MODEL_READY_TIMEOUT)
+    transcription = await transcribe_service.transcribe_audio(audio_file, filename)
+    
+    if not transcription.speech_detected:
+        return UploadResponse(
+            success=False,
+            error="No speech detected in the recording. Please speak closer to the microphone and try again."
+        )
+    
+    if not transcription.raw_text:
+        return UploadResponse(
+            success=False,
+            error="Could not transcribe audio. Please speak clearly and try again."
+        )
+    
+    return await _process_transcription(
+        text=transcription.raw_text,
+        transcription_confidence=transcription.confidence,
+        audio_url=audio_url
+    )
+
+
 @router.post("/upload-text", response_model=UploadResponse)
 async def upload_voice_text(input: TextInput):
     """
@@ -120,45 +228,19 @@ async def _process_transcription(
         audio_url: Optional S3 URL for the audio file
     """
     try:
-        # Prepare reasoning input
-        reasoning_input = ReasoningInput(
-            source="voice",
-            extracted_text=text,
-            extracted_amount=None,  # Let reasoning engine extract
-            extracted_date=None,
-            extracted_vendor=None,
-            extracted_gstin=None
+        reasoning_output, ledger_entry = await _run_reasoning(
+            text, transcription_confidence, audio_url
         )
         
-        # Process through spec-driven reasoning engine
-        reasoning_output = reasoning_engine.process(reasoning_input)
-        
-        # Combine transcription and reasoning confidence
-        combined_confidence = round(
-            min(transcription_confidence, reasoning_output.confidence),
-            2
-        )
-        
-        # Create ledger entry
-        ledger_entry = LedgerEntry(
-            date=datetime.now().strftime('%Y-%m-%d'),
-            amount=reasoning_output.amount,
-            category=reasoning_output.category,
-            gst_rate=reasoning_output.gst_rate,
-            gst_amount=reasoning_output.gst_amount,
-            source="voice",
-            confidence=combined_confidence,
-            explanation=reasoning_output.explanation,
-            raw_text=text,
-            audio_url=audio_url
-        )
-        
-        # Save to DynamoDB
+        # Save to DynamoDB; an entry that was not stored is never returned
         try:
-            dynamodb_service.save_entry(ledger_entry)
+            await entry_batcher.save(ledger_entry)
         except Exception as e:
             print(f"DynamoDB save failed: {e}")
-            # Continue anyway - entry is still valid
+            return UploadResponse(
+                success=False,
+                error="Could not save the entry. Please try again."
+            )
         
         return UploadResponse(
             success=True,
@@ -175,47 +257,65 @@ async def _process_transcription(
         )
 
 
+async def _run_reasoning(
+    text: str,
+    transcription_confidence: float,
+    audio_url: Optional[str]
+) -> tuple[ReasoningOutput, LedgerEntry]:
+    """Run the reasoning engine on transcribed text and build the ledger entry."""
+    # Prepare reasoning input
+    reasoning_input = ReasoningInput(
+        source="voice",
+        extracted_text=text,
+        extracted_amount=None,  # Let reasoning engine extract
+        extracted_date=None,
+        extracted_vendor=None,
+        extracted_gstin=None
+    )
+    
+    # Process through spec-driven reasoning engine
+    reasoning_output = await reasoning_engine.process(reasoning_input)
+    
+    # Combine transcription and reasoning confidence
+    combined_confidence = round(
+        min(transcription_confidence, reasoning_output.confidence),
+        2
+    )
+    
+    # Create ledger entry
+    ledger_entry = LedgerEntry(
+        date=datetime.now().strftime('%Y-%m-%d'),
+        amount=reasoning_output.amount,
+        category=reasoning_output.category,
+        gst_rate=reasoning_output.gst_rate,
+        gst_amount=reasoning_output.gst_amount,
+        source="voice",
+        confidence=combined_confidence,
+        explanation=reasoning_output.explanation,
+        raw_text=text,
+        audio_url=audio_url
+    )
+    return reasoning_output, ledger_entry
+
+
 @router.post("/confirm", response_model=UploadResponse)
 async def confirm_voice(request: ConfirmationRequest):
     """Confirm or correct a low-confidence voice entry."""
     try:
-        entry = dynamodb_service.get_entry(request.transaction_id)
-        if not entry:
-            raise HTTPException(status_code=404, detail="Entry not found")
-        
-        updates = {}
-        
-        # Update amount if provided
-        if request.confirmed_amount is not None:
-            updates['amount'] = request.confirmed_amount
-            updates['gst_amount'] = round(
-                request.confirmed_amount * entry.gst_rate / 100, 2
-            )
-        
-        # Update category if provided
+        # New GST rate from specs if the category changed
+        gst_rate = None
         if request.confirmed_category is not None:
-            updates['category'] = request.confirmed_category
-            # Get new GST rate from specs
-            specs = reasoning_engine.specs
-            new_gst_rate = specs['categories'].get(
-                request.confirmed_category, {}
-            ).get('gst_rate', 18)
-            updates['gst_rate'] = new_gst_rate
-            # Recalculate GST amount
-            amount = request.confirmed_amount or entry.amount
-            updates['gst_amount'] = round(amount * new_gst_rate / 100, 2)
+            gst_rate = CATEGORY_GST_RATE.get(request.confirmed_category, 18)
         
-        # Mark as confirmed
-        updates['confidence'] = 1.0
-        updates['explanation'] = entry.explanation + " [User confirmed]"
-        
-        # Update in DynamoDB
-        if updates:
-            updated_entry = dynamodb_service.update_entry(
-                request.transaction_id, updates
-            )
-        else:
-            updated_entry = entry
+        updated_entry = await run_in_threadpool(
+            dynamodb_service.confirm_entry,
+            request.transaction_id,
+            request.confirmed_amount,
+            request.confirmed_category,
+            gst_rate
+        )
+        if not updated_entry:
+            raise HTTPException(status_code=404, detail="Entry not found")
         
         return UploadResponse(
             success=True,
@@ -0,0 +1,47 @@
+"""Shared OpenAI / OpenRouter clients on one HTTP/2 connection pool"""
+from functools import lru_cache
+from typing import Optional
+import httpx
+from openai import AsyncOpenAI
+from config import get_settings
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# One pool for every LLM call; HTTP/2 multiplexes concurrent requests over
+# a single TLS connection per host
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+
+
+@lru_cache(maxsize=1)
+def _get_http_client() -> httpx.AsyncClient:
+    """The shared async HTTP client behind every SDK client"""
+    return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS)
+
+
+def _make_client(api_key: str, base_url: Optional[str] = None) -> AsyncOpenAI:
+    settings = get_settings()
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        max_retries=settings.openai_max_retries,
+        timeout=settings.openai_timeout,
+        http_client=_get_http_client()
+    )
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> Optional[AsyncOpenAI]:
+    """OpenAI client, or None without OPENAI_API_KEY"""
+    settings = get_settings()
+    if not settings.openai_api_key:
+        return None
+    return _make_client(settings.openai_api_key)
+
+
+@lru_cache(maxsize=1)
+def get_openrouter_client() -> Optional[AsyncOpenAI]:
+    """OpenRouter client, or None without OPENROUTER_API_KEY"""
+    settings = get_settings()
+    if not settings.openrouter_api_key:
+        return None
+    return _make_client(settings.openrouter_api_key, OPENROUTER_BASE_URL)
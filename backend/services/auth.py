@@ -1,17 +1,21 @@
 """Authentication Service - JWT + DynamoDB Users"""
-import boto3
+import bcrypt
+import hashlib
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
+from botocore.exceptions import ClientError
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from config import get_settings
+from services.aws import session, BOTO_CONFIG
 
 settings = get_settings()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing - cost 12, the same as the hashes passlib produced
+BCRYPT_ROUNDS = 12
 
 # JWT settings
 SECRET_KEY = settings.openai_api_key[:32] if settings.openai_api_key else "finguru-secret-key-change-me"
@@ -21,25 +25,28 @@ ACCESS_TOKEN_EXPIRE_DAYS = 7
 # Security
 security = HTTPBearer()
 
+# Authenticated users by token, so repeat requests skip the users-table read
+USER_CACHE_TTL = 60
+USER_CACHE_MAX = 10_000
+_user_cache: dict[str, tuple[float, dict]] = {}
+
 # DynamoDB
-dynamodb = boto3.resource(
-    'dynamodb',
-    region_name=settings.aws_region,
-    aws_access_key_id=settings.aws_access_key_id,
-    aws_secret_access_key=settings.aws_secret_access_key
-)
+dynamodb = session.resource('dynamodb', config=BOTO_CONFIG)
 
 USERS_TABLE = "finguru-users"
 
 
+@lru_cache(maxsize=1)
 def get_users_table():
-    """Get or create users table"""
+    """Get or create users table (resolved once per process)"""
     try:
         table = dynamodb.Table(USERS_TABLE)
         table.load()
         return table
-    except:
-        # Create table if not exists
+    except ClientError as e:
+        # Only a missing table is created; anything else is a real error
+        if e.response['Error']['Code'] != 'ResourceNotFoundException':
+            raise
         table = dynamodb.create_table(
             TableName=USERS_TABLE,
             KeySchema=[{'AttributeName': 'email', 'KeyType': 'HASH'}],
@@ -51,17 +58,17 @@ def get_users_table():
 
 
 # Password hashing - use sha256 pre-hash for bcrypt compatibility
-import hashlib
+def _prehash(password: str) -> bytes:
+    # Pre-hash with sha256 to handle any length password
+    return hashlib.sha256(password.encode()).hexdigest().encode()
+
 
 def hash_password(password: str) -> str:
-    # Pre-hash with sha256 to handle any length password
-    prehash = hashlib.sha256(password.encode()).hexdigest()
-    return pwd_context.hash(prehash)
+    return bcrypt.hashpw(_prehash(password), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 
 def verify_password(plain: str, hashed: str) -> bool:
-    prehash = hashlib.sha256(plain.encode()).hexdigest()
-    return pwd_context.verify(prehash, hashed)
+    return bcrypt.checkpw(_prehash(plain), hashed.encode())
 
 
 def create_token(email: str) -> str:
@@ -69,14 +76,36 @@ def create_token(email: str) -> str:
     return jwt.encode({"sub": email, "exp": expire}, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def decode_token(token: str) -> Optional[str]:
+def decode_claims(token: str) -> Optional[dict]:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("sub")
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
 
 
+def decode_token(token: str) -> Optional[str]:
+    payload = decode_claims(token)
+    return payload.get("sub") if payload else None
+
+
+def _cache_user(token: str, user: dict, exp: Optional[int]):
+    """Remember a looked-up user until the TTL or the token's expiry, whichever is first"""
+    now = time.monotonic()
+    ttl = USER_CACHE_TTL
+    if exp is not None:
+        ttl = min(ttl, exp - time.time())
+    if ttl <= 0:
+        return
+    
+    if len(_user_cache) >= USER_CACHE_MAX:
+        for key in [k for k, (deadline, _) in _user_cache.items() if deadline <= now]:
+            del _user_cache[key]
+        if len(_user_cache) >= USER_CACHE_MAX:
+            # Still full - drop the oldest insertion
+            del _user_cache[next(iter(_user_cache))]
+    _user_cache[token] = (now + ttl, user)
+
+
 def register_user(email: str, password: str, name: str) -> dict:
     """Register new user"""
     table = get_users_table()
@@ -116,7 +145,15 @@ def authenticate_user(email: str, password: str) -> Optional[dict]:
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Dependency to get current authenticated user"""
     token = credentials.credentials
-    email = decode_token(token)
+    cached = _user_cache.get(token)
+    if cached:
+        deadline, user = cached
+        if deadline > time.monotonic():
+            return user
+        _user_cache.pop(token, None)
+    
+    payload = decode_claims(token)
+    email = payload.get("sub") if payload else None
     
     if not email:
         raise HTTPException(
@@ -130,5 +167,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     if 'Item' not in response:
         raise HTTPException(status_code=401, detail="User not found")
     
-    user = response['Item']
-    return {"email": user['email'], "name": user['name']}
+    item = response['Item']
+    user = {"email": item['email'], "name": item['name']}
+    _cache_user(token, user, payload.get("exp"))
+    return user
@@ -0,0 +1,20 @@
+"""Shared boto3 session and client configuration for AWS services"""
+import boto3
+from botocore.config import Config
+from config import get_settings, AWS_REGION
+
+# One pool large enough for the request threadpool, with client-side
+# rate adaptation on throttling
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"}
+)
+
+_settings = get_settings()
+
+# Blank keys fall back to the default credential chain (env, instance role)
+session = boto3.session.Session(
+    aws_access_key_id=_settings.aws_access_key_id or None,
+    aws_secret_access_key=_settings.aws_secret_access_key or None,
+    region_name=AWS_REGION
+)
@@ -0,0 +1,90 @@
+"""OpenAI Batch API jobs for offline bulk reasoning (re-categorization, reprocessing)"""
+import io
+import json
+from typing import Optional
+from models.schemas import ReasoningInput
+from services.reasoning import reasoning_engine
+
+# Endpoint every batch line targets
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Batch jobs finish within this window (and cost half the online price)
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Terminal batch states that will never produce output
+BATCH_FAILED_STATES = frozenset({"failed", "expired", "cancelled"})
+
+
+class BatchService:
+    """Submits reasoning requests to the OpenAI Batch API and collects results"""
+    
+    def __init__(self):
+        # The Batch API is OpenAI-only; OpenRouter has no equivalent
+        self.enabled = bool(reasoning_engine.settings.openai_api_key)
+    
+    async def submit_categorization_batch(self, items: dict[str, ReasoningInput]) -> str:
+        """
+        Submit one batch job for the given inputs and return its batch id.
+        
+        items maps a custom id (the ledger transaction_id) to its input; the
+        same id comes back on each result line.
+        """
+        if not self.enabled:
+            raise RuntimeError("Batch processing needs OPENAI_API_KEY")
+        
+        lines = [
+            json.dumps({
+                "custom_id": item_id,
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": reasoning_engine.request_body(input_data)
+            })
+            for item_id, input_data in items.items()
+        ]
+        client = reasoning_engine.client
+        batch_file = await client.files.create(
+            file=("batch.jsonl", io.BytesIO("\n".join(lines).encode())),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        print(f"Submitted batch {batch.id} with {len(lines)} requests")
+        return batch.id
+    
+    async def get_batch_results(self, batch_id: str) -> Optional[dict[str, dict]]:
+        """
+        Parsed results of a finished batch keyed by custom id, or None while
+        it is still running. Lines that errored are left out.
+        """
+        batch = await reasoning_engine.client.batches.retrieve(batch_id)
+        if batch.status in BATCH_FAILED_STATES:
+            raise RuntimeError(f"Batch {batch_id} {batch.status}")
+        if batch.status != "completed":
+            return None
+        if not batch.output_file_id:
+            return {}
+        
+        content = await reasoning_engine.client.files.content(batch.output_file_id)
+        results = {}
+        for line in content.text.splitlines():
+            if not line:
+                continue
+            record = json.loads(line)
+            item_id = record["custom_id"]
+            response = record.get("response")
+            if not response or response["status_code"] != 200:
+                print(f"Batch {batch_id}: no result for {item_id}")
+                continue
+            try:
+                message = response["body"]["choices"][0]["message"]["content"]
+                results[item_id] = json.loads(message)
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"Batch {batch_id}: bad result for {item_id}: {e}")
+        return results
+
+
+# Singleton instance
+batch_service = BatchService()
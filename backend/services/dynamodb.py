@@ -1,145 +1,521 @@
 """Amazon DynamoDB service for ledger storage"""
-import boto3
+import asyncio
+import threading
+from collections import defaultdict
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
 from datetime import datetime, timedelta
 from typing import Optional
-from decimal import Decimal
-from config import get_settings
+from decimal import Decimal, ROUND_HALF_UP
+from config import DDB_TABLE
+from services.aws import session, BOTO_CONFIG
 from models.schemas import LedgerEntry, DailySummary
 
+# Every ledger item carries this constant partition key so the date-index
+# GSI (gsi_pk HASH, date RANGE) can answer date range queries directly
+GSI_PK = "LEDGER"
+DATE_INDEX = "date-index"
+RECENCY_INDEX = "recency-index"
+
+# Running totals over the whole ledger live in one item of the same table,
+# kept current with atomic ADD updates on every write (materialized view)
+SUMMARY_KEY = "SUMMARY#ALL"
+# Keys under this prefix are never ledger entries
+RESERVED_KEY_PREFIX = "SUMMARY#"
+CATEGORY_AMOUNT_PREFIX = "amount:"
+CATEGORY_GST_PREFIX = "gst:"
+
+OPTIONAL_FIELDS = ('vendor_name', 'vendor_gstin', 'receipt_url', 'audio_url', 'raw_text')
+# The only number attributes a ledger item carries (stored as Decimal)
+NUMERIC_FIELDS = ('amount', 'gst_rate', 'gst_amount', 'confidence')
+
+# Single saves arriving within this window are written as one batch
+SAVE_BATCH_WINDOW = 0.02  # seconds
+SAVE_BATCH_MAX = 25  # items per BatchWriteItem call
+
+# Read-then-write retries for a confirmation racing another update
+CONFIRM_ATTEMPTS = 3
+CONFIRMED_SUFFIX = " [User confirmed]"
+
 
 class DynamoDBService:
     """Handle DynamoDB operations for ledger entries"""
     
     def __init__(self):
-        settings = get_settings()
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region
-        )
-        self.table = self.dynamodb.Table(settings.dynamodb_table_name)
+        self.dynamodb = session.resource('dynamodb', config=BOTO_CONFIG)
+        self.table = self.dynamodb.Table(DDB_TABLE)
+        
+        # Bumped on every write so read-side caches know when to recompute
+        self.ledger_version = 0
+        self._version_lock = threading.Lock()
+    
+    def invalidate(self) -> int:
+        """Mark the ledger as changed and return the new version"""
+        with self._version_lock:
+            self.ledger_version += 1
+            return self.ledger_version
     
     def save_entry(self, entry: LedgerEntry) -> LedgerEntry:
         """Save ledger entry to DynamoDB"""
         item = self._to_dynamodb_item(entry)
-        self.table.put_item(Item=item)
+        response = self.table.put_item(Item=item, ReturnValues='ALL_OLD')
+        
+        # An overwrite replaces the old entry's contribution to the summary
+        deltas = [self._summary_delta(item, sign=1)]
+        old_item = response.get('Attributes')
+        if old_item:
+            deltas.append(self._summary_delta(old_item, sign=-1))
+        self._apply_summary_deltas(deltas)
+        
+        self.invalidate()
         return entry
     
+    def save_entries(self, entries: list[LedgerEntry]) -> list[LedgerEntry]:
+        """
+        Save new ledger entries with batched writes.
+        
+        BatchWriteItem can't report overwritten items, so this is for fresh
+        entries only; use save_entry to replace an existing one.
+        """
+        if not entries:
+            return entries
+        
+        items = {}
+        for entry in entries:
+            items[entry.transaction_id] = self._to_dynamodb_item(entry)
+        
+        # batch_writer sends 25 items per call and resends unprocessed ones
+        with self.table.batch_writer(overwrite_by_pkeys=['transaction_id']) as writer:
+            for item in items.values():
+                writer.put_item(Item=item)
+        
+        self._apply_summary_deltas([self._summary_delta(item, sign=1) for item in items.values()])
+        self.invalidate()
+        return entries
+    
     def get_entry(self, transaction_id: str) -> Optional[LedgerEntry]:
         """Get single ledger entry by ID"""
+        if self._is_reserved(transaction_id):
+            return None
         response = self.table.get_item(Key={'transaction_id': transaction_id})
         item = response.get('Item')
         return self._from_dynamodb_item(item) if item else None
     
-    def update_entry(self, transaction_id: str, updates: dict) -> Optional[LedgerEntry]:
-        """Update existing ledger entry"""
+    def update_entry(
+        self,
+        transaction_id: str,
+        updates: dict,
+        expected: Optional[dict] = None
+    ) -> Optional[LedgerEntry]:
+        """
+        Update existing ledger entry, or return None if it does not exist.
+        
+        If expected is given, the update only applies while those attributes
+        still hold the given values; otherwise None is returned as well.
+        """
+        if self._is_reserved(transaction_id):
+            return None
+        
         update_expr = "SET " + ", ".join(f"#{k} = :{k}" for k in updates.keys())
         expr_names = {f"#{k}": k for k in updates.keys()}
         expr_values = {f":{k}": self._convert_value(v) for k, v in updates.items()}
         
-        response = self.table.update_item(
-            Key={'transaction_id': transaction_id},
-            UpdateExpression=update_expr,
-            ExpressionAttributeNames=expr_names,
-            ExpressionAttributeValues=expr_values,
-            ReturnValues='ALL_NEW'
-        )
+        # The condition stops a stale id from upserting a partial item
+        condition = 'attribute_exists(transaction_id)'
+        for k, v in (expected or {}).items():
+            condition += f" AND #{k} = :old_{k}"
+            expr_names[f"#{k}"] = k
+            expr_values[f":old_{k}"] = self._convert_value(v)
         
-        return self._from_dynamodb_item(response.get('Attributes'))
+        try:
+            response = self.table.update_item(
+                Key={'transaction_id': transaction_id},
+                UpdateExpression=update_expr,
+                ConditionExpression=condition,
+                ExpressionAttributeNames=expr_names,
+                ExpressionAttributeValues=expr_values,
+                ReturnValues='ALL_OLD'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            return None
+        
+        # SET only replaces the given attributes, so the new item is the old
+        # one with the updates applied
+        old_item = response.get('Attributes', {})
+        new_item = {**old_item}
+        for k, v in updates.items():
+            new_item[k] = self._convert_value(v)
+        
+        if 'amount' in old_item:
+            self._apply_summary_deltas([
+                self._summary_delta(old_item, sign=-1),
+                self._summary_delta(new_item, sign=1)
+            ])
+        self.invalidate()
+        
+        return self._from_dynamodb_item(new_item)
+    
+    def confirm_entry(
+        self,
+        transaction_id: str,
+        amount: Optional[float] = None,
+        category: Optional[str] = None,
+        gst_rate: Optional[float] = None
+    ) -> Optional[LedgerEntry]:
+        """
+        Apply a user's confirmation/correction, or return None if the entry
+        does not exist.
+        
+        DynamoDB can't multiply or append strings in an update, so the few
+        attributes GST and the explanation depend on are read first. The write
+        is conditioned on them, and retried if another update got in between.
+        """
+        for _ in range(CONFIRM_ATTEMPTS):
+            response = self.table.get_item(
+                Key={'transaction_id': transaction_id},
+                ConsistentRead=True,
+                ProjectionExpression='#amount, #gst_rate, #explanation',
+                ExpressionAttributeNames={
+                    '#amount': 'amount',
+                    '#gst_rate': 'gst_rate',
+                    '#explanation': 'explanation'
+                }
+            )
+            current = response.get('Item')
+            if not current:
+                return None
+            
+            updates = {}
+            if amount is not None:
+                updates['amount'] = Decimal(str(amount))
+            if category is not None:
+                updates['category'] = category
+            if gst_rate is not None:
+                updates['gst_rate'] = Decimal(str(gst_rate))
+            
+            # Recompute GST once both amount and rate are settled
+            if updates:
+                new_amount = updates.get('amount', current['amount'])
+                new_rate = updates.get('gst_rate', current['gst_rate'])
+                updates['gst_amount'] = (new_amount * new_rate / 100).quantize(
+                    Decimal('0.01'), rounding=ROUND_HALF_UP
+                )
+            
+            updates['confidence'] = Decimal('1.0')
+            updates['explanation'] = current['explanation'] + CONFIRMED_SUFFIX
+            
+            entry = self.update_entry(transaction_id, updates, expected=current)
+            if entry:
+                return entry
+        
+        raise RuntimeError("Entry is being modified concurrently, please retry")
     
     def get_entries_by_date(self, date: str) -> list[LedgerEntry]:
         """Get all entries for a specific date"""
-        response = self.table.scan(
-            FilterExpression='begins_with(#date, :date_prefix)',
-            ExpressionAttributeNames={'#date': 'date'},
-            ExpressionAttributeValues={':date_prefix': date}
-        )
-        
-        items = response.get('Items', [])
+        items = self._query_date_index(Key('date').begins_with(date))
         return [self._from_dynamodb_item(item) for item in items]
     
     def get_entries_range(self, start_date: str, end_date: str) -> list[LedgerEntry]:
-        """Get entries within date range"""
-        response = self.table.scan(
-            FilterExpression='#date BETWEEN :start AND :end',
-            ExpressionAttributeNames={'#date': 'date'},
-            ExpressionAttributeValues={
-                ':start': start_date,
-                ':end': end_date
+        """Get entries within date range with a single query on the date index"""
+        items = self._query_date_index(Key('date').between(start_date, end_date))
+        return [self._from_dynamodb_item(item) for item in items]
+    
+    def get_range_summary(self, start_date: str, end_date: str) -> dict:
+        """Aggregate entries within a date range page by page without building models"""
+        query_kwargs = {
+            'IndexName': DATE_INDEX,
+            'KeyConditionExpression': Key('gsi_pk').eq(GSI_PK) & Key('date').between(start_date, end_date),
+            'ProjectionExpression': '#amount, #gst_amount, #category, #source',
+            'ExpressionAttributeNames': {
+                '#amount': 'amount',
+                '#gst_amount': 'gst_amount',
+                '#category': 'category',
+                '#source': 'source'
             }
-        )
+        }
         
-        items = response.get('Items', [])
-        return [self._from_dynamodb_item(item) for item in items]
+        entry_count = 0
+        total_amount = 0
+        total_gst = 0
+        by_category = defaultdict(float)
+        gst_by_category = defaultdict(float)
+        by_source = defaultdict(float, receipt=0, voice=0)
+        
+        # Only the running totals are kept in memory, never the whole range
+        while True:
+            response = self.table.query(**query_kwargs)
+            for item in response.get('Items', []):
+                cat = item['category']
+                amount = float(item['amount'])
+                gst_amount = float(item['gst_amount'])
+                entry_count += 1
+                total_amount += amount
+                total_gst += gst_amount
+                by_category[cat] += amount
+                gst_by_category[cat] += gst_amount
+                by_source[item['source']] += amount
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
+        return {
+            'total_amount': round(total_amount, 2),
+            'total_gst': round(total_gst, 2),
+            'entry_count': entry_count,
+            'by_category': {k: round(v, 2) for k, v in by_category.items()},
+            'gst_by_category': {k: round(v, 2) for k, v in gst_by_category.items()},
+            'by_source': dict(by_source)
+        }
     
     def get_recent_entries(self, limit: int = 20) -> list[LedgerEntry]:
-        """Get most recent entries"""
-        response = self.table.scan(Limit=limit * 2)  # Scan more to sort
-        items = response.get('Items', [])
+        """Get most recent entries, newest first, from the recency index"""
+        response = self.table.query(
+            IndexName=RECENCY_INDEX,
+            KeyConditionExpression=Key('gsi_pk').eq(GSI_PK),
+            ScanIndexForward=False,
+            Limit=limit
+        )
+        
+        return [self._from_dynamodb_item(item) for item in response.get('Items', [])]
+    
+    def get_summary(self) -> dict:
+        """Get all-time totals and category breakdowns from the summary item"""
+        response = self.table.get_item(Key={'transaction_id': SUMMARY_KEY})
+        item = response.get('Item')
+        if item is None:
+            item = self._rebuild_summary()
+        if item is None:
+            # Another request created it first
+            item = self.table.get_item(
+                Key={'transaction_id': SUMMARY_KEY}, ConsistentRead=True
+            )['Item']
         
-        # Sort by created_at descending
-        items.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+        by_category = {}
+        gst_by_category = {}
+        for key, value in item.items():
+            if key.startswith(CATEGORY_AMOUNT_PREFIX) and value:
+                cat = key[len(CATEGORY_AMOUNT_PREFIX):]
+                by_category[cat] = float(value)
+                gst_by_category[cat] = float(item.get(CATEGORY_GST_PREFIX + cat, 0))
         
-        return [self._from_dynamodb_item(item) for item in items[:limit]]
+        return {
+            'total_amount': float(item.get('total_amount', 0)),
+            'total_gst': float(item.get('total_gst', 0)),
+            'entry_count': int(item.get('entry_count', 0)),
+            'by_category': by_category,
+            'gst_by_category': gst_by_category
+        }
     
     def get_daily_summary(self, date: Optional[str] = None) -> DailySummary:
         """Generate daily summary"""
         if date is None:
             # Use local time instead of UTC for better user experience
-            from datetime import timezone
-            import time
-            # Get local date
             date = datetime.now().strftime('%Y-%m-%d')
         
-        entries = self.get_entries_by_date(date)
-        
-        total_amount = sum(e.amount for e in entries)
-        total_gst = sum(e.gst_amount for e in entries)
-        
-        by_category = {}
-        gst_by_category = {}
+        # Only the aggregated fields are fetched, and no models are built
+        items = self._query_date_index(
+            Key('date').begins_with(date),
+            ProjectionExpression='#amount, #gst_amount, #category',
+            ExpressionAttributeNames={
+                '#amount': 'amount',
+                '#gst_amount': 'gst_amount',
+                '#category': 'category'
+            }
+        )
+        columns = self._items_to_columns(items, ('amount', 'gst_amount', 'category'))
+        amounts = columns['amount']
+        gst_amounts = columns['gst_amount']
         
-        for entry in entries:
-            cat = entry.category
-            by_category[cat] = by_category.get(cat, 0) + entry.amount
-            gst_by_category[cat] = gst_by_category.get(cat, 0) + entry.gst_amount
+        by_category = defaultdict(Decimal)
+        gst_by_category = defaultdict(Decimal)
+        for cat, amount, gst_amount in zip(columns['category'], amounts, gst_amounts):
+            by_category[cat] += amount
+            gst_by_category[cat] += gst_amount
         
+        # Sums stay in Decimal until the end, so they are exact
         return DailySummary(
             date=date,
-            total_amount=round(total_amount, 2),
-            total_gst=round(total_gst, 2),
-            entry_count=len(entries),
-            by_category={k: round(v, 2) for k, v in by_category.items()},
-            gst_by_category={k: round(v, 2) for k, v in gst_by_category.items()}
+            total_amount=round(float(sum(amounts)), 2),
+            total_gst=round(float(sum(gst_amounts)), 2),
+            entry_count=len(items),
+            by_category={k: round(float(v), 2) for k, v in by_category.items()},
+            gst_by_category={k: round(float(v), 2) for k, v in gst_by_category.items()}
         )
     
     def delete_entry(self, transaction_id: str) -> bool:
-        """Delete ledger entry"""
+        """Delete ledger entry, or return False if it does not exist"""
+        if self._is_reserved(transaction_id):
+            return False
         try:
-            self.table.delete_item(Key={'transaction_id': transaction_id})
-            return True
-        except Exception:
+            response = self.table.delete_item(
+                Key={'transaction_id': transaction_id},
+                ConditionExpression='attribute_exists(transaction_id)',
+                ReturnValues='ALL_OLD'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
             return False
+        self.invalidate()
+        
+        # The entry is gone either way; a failed summary update only leaves
+        # the totals stale until the next rebuild
+        try:
+            self._apply_summary_deltas([self._summary_delta(response['Attributes'], sign=-1)])
+        except Exception as e:
+            print(f"Summary update failed after deleting {transaction_id}: {e}")
+        return True
+    
+    def _is_reserved(self, transaction_id: str) -> bool:
+        """Whether the key belongs to a non-entry item such as the summary"""
+        return transaction_id.startswith(RESERVED_KEY_PREFIX)
+    
+    def _summary_delta(self, item: dict, sign: int) -> tuple[str, Decimal, Decimal, int]:
+        """Build a (category, amount, gst, count) delta adding (+1) or removing (-1) an item"""
+        return (
+            item['category'],
+            sign * Decimal(item['amount']),
+            sign * Decimal(item['gst_amount']),
+            sign
+        )
+    
+    def _apply_summary_deltas(self, deltas: list[tuple[str, Decimal, Decimal, int]]):
+        """Atomically add entry deltas to the summary item"""
+        totals = {'total_amount': Decimal(0), 'total_gst': Decimal(0), 'entry_count': 0}
+        for category, amount, gst_amount, count in deltas:
+            totals['total_amount'] += amount
+            totals['total_gst'] += gst_amount
+            totals['entry_count'] += count
+            totals[CATEGORY_AMOUNT_PREFIX + category] = totals.get(CATEGORY_AMOUNT_PREFIX + category, 0) + amount
+            totals[CATEGORY_GST_PREFIX + category] = totals.get(CATEGORY_GST_PREFIX + category, 0) + gst_amount
+        
+        names = list(totals.keys())
+        update_kwargs = {
+            'Key': {'transaction_id': SUMMARY_KEY},
+            'UpdateExpression': "ADD " + ", ".join(f"#a{i} :a{i}" for i in range(len(names))),
+            'ConditionExpression': 'attribute_exists(transaction_id)',
+            'ExpressionAttributeNames': {f"#a{i}": name for i, name in enumerate(names)},
+            'ExpressionAttributeValues': {f":a{i}": totals[name] for i, name in enumerate(names)}
+        }
+        try:
+            self.table.update_item(**update_kwargs)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            # No summary yet - build it from a consistent scan, which already
+            # sees this write. If another writer created it meanwhile, its
+            # totals may not include this write, so add it after all
+            if self._rebuild_summary() is None:
+                self.table.update_item(**update_kwargs)
+    
+    def _rebuild_summary(self, replace: bool = False) -> Optional[dict]:
+        """
+        Recompute the summary item from a full table scan and store it.
+        
+        Unless replace is set, an existing summary is never overwritten;
+        None is returned when one appeared during the scan.
+        """
+        scan_kwargs = {
+            'ProjectionExpression': 'transaction_id, amount, gst_amount, category',
+            'ConsistentRead': True
+        }
+        
+        deltas = []
+        while True:
+            response = self.table.scan(**scan_kwargs)
+            for item in response.get('Items', []):
+                if not self._is_reserved(item['transaction_id']):
+                    deltas.append(self._summary_delta(item, sign=1))
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
+        summary = {
+            'transaction_id': SUMMARY_KEY,
+            'total_amount': Decimal(0),
+            'total_gst': Decimal(0),
+            'entry_count': len(deltas)
+        }
+        for category, amount, gst_amount, _ in deltas:
+            summary['total_amount'] += amount
+            summary['total_gst'] += gst_amount
+            summary[CATEGORY_AMOUNT_PREFIX + category] = summary.get(CATEGORY_AMOUNT_PREFIX + category, 0) + amount
+            summary[CATEGORY_GST_PREFIX + category] = summary.get(CATEGORY_GST_PREFIX + category, 0) + gst_amount
+        
+        if replace:
+            self.table.put_item(Item=summary)
+            return summary
+        try:
+            self.table.put_item(
+                Item=summary,
+                ConditionExpression='attribute_not_exists(transaction_id)'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            return None
+        return summary
+    
+    def _query_date_index(self, date_condition, **kwargs) -> list[dict]:
+        """Fetch every raw item on the date index that matches a date condition"""
+        query_kwargs = {
+            'IndexName': DATE_INDEX,
+            'KeyConditionExpression': Key('gsi_pk').eq(GSI_PK) & date_condition,
+            **kwargs
+        }
+        
+        items = []
+        while True:
+            response = self.table.query(**query_kwargs)
+            items.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        return items
+    
+    def _items_to_columns(self, items: list[dict], fields: tuple[str, ...]) -> dict[str, list]:
+        """Lay raw items out column-wise, one list per field, in a single pass"""
+        columns = {field: [] for field in fields}
+        appends = [(field, columns[field].append) for field in fields]
+        for item in items:
+            for field, append in appends:
+                append(item[field])
+        return columns
     
     def _to_dynamodb_item(self, entry: LedgerEntry) -> dict:
         """Convert LedgerEntry to DynamoDB item"""
-        item = entry.model_dump()
-        # Convert floats to Decimal for DynamoDB
-        for key, value in item.items():
-            if isinstance(value, float):
-                item[key] = Decimal(str(value))
+        # Built field by field rather than via model_dump(); floats become
+        # Decimal as DynamoDB requires
+        item = {
+            'transaction_id': entry.transaction_id,
+            'gsi_pk': GSI_PK,
+            'date': entry.date,
+            'amount': Decimal(str(entry.amount)),
+            'category': entry.category,
+            'gst_rate': Decimal(str(entry.gst_rate)),
+            'gst_amount': Decimal(str(entry.gst_amount)),
+            'source': entry.source,
+            'confidence': Decimal(str(entry.confidence)),
+            'explanation': entry.explanation,
+            'created_at': entry.created_at
+        }
+        # Optional fields are only stored when set
+        for key in OPTIONAL_FIELDS:
+            value = getattr(entry, key)
+            if value is not None:
+                item[key] = value
         return item
     
     def _from_dynamodb_item(self, item: dict) -> LedgerEntry:
         """Convert DynamoDB item to LedgerEntry"""
         if item is None:
             return None
-        # Convert Decimals back to floats
-        for key, value in item.items():
-            if isinstance(value, Decimal):
-                item[key] = float(value)
-        return LedgerEntry(**item)
+        # Convert Decimals back to floats for the known numeric fields only
+        item.update({key: float(item[key]) for key in NUMERIC_FIELDS if key in item})
+        # Items were validated on write, so skip re-validation on read
+        return LedgerEntry.model_construct(**item)
     
     def _convert_value(self, value):
         """Convert Python value to DynamoDB compatible"""
@@ -148,5 +524,78 @@ class DynamoDBService:
         return value
 
 
-# Singleton instance
+class EntrySaveBatcher:
+    """
+    Coalesce concurrent single-entry saves into batched writes.
+    
+    Callers await save(); a background task collects whatever arrives within
+    SAVE_BATCH_WINDOW (up to SAVE_BATCH_MAX entries) and writes it with
+    save_entries in a worker thread.
+    """
+    
+    def __init__(self, service: DynamoDBService):
+        self.service = service
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def save(self, entry: LedgerEntry) -> LedgerEntry:
+        """Queue an entry and wait until its batch is written"""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        
+        future = loop.create_future()
+        await self._queue.put((entry, future))
+        return await future
+    
+    async def close(self):
+        """Write anything still queued and stop the background task"""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = loop.time() + SAVE_BATCH_WINDOW
+            stop = False
+            while len(batch) < SAVE_BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if pending is None:
+                    stop = True
+                    break
+                batch.append(pending)
+            
+            await self._write(batch)
+            if stop:
+                return
+    
+    async def _write(self, batch: list[tuple[LedgerEntry, asyncio.Future]]):
+        try:
+            await asyncio.to_thread(self.service.save_entries, [entry for entry, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for entry, future in batch:
+            if not future.done():
+                future.set_result(entry)
+
+
+# Singleton instances
 dynamodb_service = DynamoDBService()
+entry_batcher = EntrySaveBatcher(dynamodb_service)
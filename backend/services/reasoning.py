@@ -7,15 +7,21 @@ This is NOT a chatbot wrapper. GPT-4.1 is used as a constrained reasoning engine
 - JSON schema enforces structured output
 - Confidence scores enable human-in-the-loop
 """
+import os
 import re
+import asyncio
 import yaml
 import json
+import hashlib
+import threading
+import ahocorasick
+from collections import Counter, OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
-from openai import OpenAI
-from config import get_settings
+from config import get_settings, CONFIDENCE_THRESHOLD
 from models.schemas import ReasoningInput, ReasoningOutput
+from services._openai_client import get_openai_client, get_openrouter_client
 
 
 # JSON Schema for GPT-4.1 structured output
@@ -40,20 +46,86 @@ REASONING_SCHEMA = {
         },
         "rule_applied": {
             "type": "string",
-            "description": "Which accounting rule was applied"
+            "description": "Rule applied, a few words"
         },
         "gst_reasoning": {
             "type": "string", 
-            "description": "Why GST rate was chosen"
+            "description": "One short sentence on the GST rate"
         },
         "explanation": {
             "type": "string",
-            "description": "Human-readable explanation of the decision"
+            "description": "One short sentence explaining the decision"
         }
     },
     "required": ["amount", "category", "confidence", "rule_applied", "gst_reasoning", "explanation"],
     "additionalProperties": False
 }
+# Schema for classifying several texts in one request
+BATCH_CATEGORY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "i": {"type": "integer", "description": "Index of the text"},
+                    "category": REASONING_SCHEMA["properties"]["category"],
+                    "confidence": REASONING_SCHEMA["properties"]["confidence"]
+                },
+                "required": ["i", "category", "confidence"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["results"],
+    "additionalProperties": False
+}
+
+# Output budget per text in a batched classification
+BATCH_TOKENS_PER_TEXT = 50
+# Texts per batched classification request; larger sets are split and
+# the requests run concurrently
+BATCH_MAX_TEXTS = 40
+
+# Last-resort amount guess: any plausible standalone number
+_FALLBACK_AMOUNT_RE = re.compile(r'\b(\d{1,6}(?:\.\d{2})?)\b')
+
+# GPT results for recently seen inputs; temperature=0 makes them repeatable
+GPT_CACHE_SIZE = 4096
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# The filled-in schema fits well under this; a tight cap keeps decode short
+GPT_MAX_TOKENS = 180
+
+# Routine classifications go to the mini model; answers below this
+# confidence are retried on the full model
+ESCALATION_CONFIDENCE = 0.75
+
+SPEC_PATH = Path(__file__).parent.parent / "specs" / "accounting.yaml"
+# Parsed copy of the specs; JSON loads far faster than YAML
+SPEC_CACHE_PATH = SPEC_PATH.with_suffix(".json")
+# libyaml's C loader when PyYAML was built with it
+_YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# GPT answers below this are flagged as low confidence rather than "verify"
+LOW_CONFIDENCE = 0.7
+
+# Keyword-rule confidence: base + per distinct keyword matched. The cap
+# equals the default confirmation threshold, so three or more distinct
+# keywords are trusted without confirmation (or a GPT pass in batches)
+KEYWORD_BASE_CONFIDENCE = 0.5
+KEYWORD_MATCH_CONFIDENCE = 0.15
+KEYWORD_MAX_CONFIDENCE = 0.85
+
+# A vendor listed in the spec's vendor_aliases settles the category outright
+VENDOR_CONFIDENCE = 0.95
+_VENDOR_WORD_RE = re.compile(r"[a-z0-9]+")
+# Trailing words of a registered company name, dropped before alias lookup
+VENDOR_NAME_SUFFIXES = frozenset({
+    'pvt', 'private', 'ltd', 'limited', 'llp', 'inc', 'co', 'corp',
+    'corporation', 'company', 'india', 'technologies', 'services', 'systems'
+})
 
 
 class ReasoningEngine:
@@ -70,26 +142,76 @@ class ReasoningEngine:
     def __init__(self):
         self.settings = get_settings()
         self.specs = self._load_specs()
+        self._keyword_automaton = self._build_keyword_automaton()
+        self._amount_patterns = [
+            (re.compile(p['pattern'], re.IGNORECASE), p['group'])
+            for p in self.specs['validation']['amount_patterns']
+        ]
+        self._vendor_categories = {
+            self._vendor_key(alias): category
+            for alias, category in (self.specs.get('vendor_aliases') or {}).items()
+            if category in self.specs['categories']
+        }
+        self._category_gst = {
+            k: v.get('gst_rate', 18) for k, v in self.specs['categories'].items()
+        }
+        # Specs never change at runtime, so the prompt is rendered once
+        self._system_prompt = self._build_system_prompt()
+        self._gpt_cache: OrderedDict[tuple, ReasoningOutput] = OrderedDict()
+        self._gpt_cache_lock = threading.Lock()
+        self._llm_slots = asyncio.Semaphore(self.settings.openai_max_concurrency)
         
-        # Initialize OpenAI client for GPT-4.1
+        # Shared OpenAI client for GPT-4.1, or OpenRouter without one
         if self.settings.openai_api_key:
-            self.client = OpenAI(api_key=self.settings.openai_api_key)
+            self.client = get_openai_client()
             self.model = "gpt-4.1-2025-04-14"  # GPT-4.1 model
+            self.model_fast = "gpt-4.1-mini-2025-04-14"
         elif self.settings.openrouter_api_key:
-            self.client = OpenAI(
-                api_key=self.settings.openrouter_api_key,
-                base_url="https://openrouter.ai/api/v1"
-            )
+            self.client = get_openrouter_client()
             self.model = "openai/gpt-4.1"
+            self.model_fast = "openai/gpt-4.1-mini"
         else:
             self.client = None
             self.model = None
+            self.model_fast = None
     
     def _load_specs(self) -> dict:
-        """Load accounting specifications - the source of truth."""
-        spec_path = Path(__file__).parent.parent / "specs" / "accounting.yaml"
-        with open(spec_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        """
+        Load accounting specifications - the source of truth.
+        
+        The YAML is parsed once into a JSON cache beside it and reloaded from
+        there while it is newer than the YAML; editing the YAML refreshes it.
+        """
+        try:
+            if SPEC_CACHE_PATH.stat().st_mtime >= SPEC_PATH.stat().st_mtime:
+                return json.loads(SPEC_CACHE_PATH.read_bytes())
+        except (OSError, ValueError):
+            pass
+        
+        with open(SPEC_PATH, 'r', encoding='utf-8') as f:
+            specs = yaml.load(f, Loader=_YAMLLoader)
+        try:
+            # Write then rename, so a concurrently starting worker never
+            # reads a half-written cache
+            tmp_path = SPEC_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(specs), encoding='utf-8')
+            os.replace(tmp_path, SPEC_CACHE_PATH)
+        except OSError as e:
+            print(f"Could not write spec cache (continuing without): {e}")
+        return specs
+    
+    def _build_keyword_automaton(self) -> ahocorasick.Automaton:
+        """Build one Aho-Corasick automaton over every category keyword."""
+        keyword_categories: dict[str, list[str]] = {}
+        for cat_key, cat_data in self.specs['categories'].items():
+            for kw in cat_data.get('keywords', []):
+                keyword_categories.setdefault(kw.lower(), []).append(cat_key)
+        
+        automaton = ahocorasick.Automaton()
+        for kw, categories in keyword_categories.items():
+            automaton.add_word(kw, (kw, tuple(categories)))
+        automaton.make_automaton()
+        return automaton
     
     def _build_system_prompt(self) -> str:
         """
@@ -99,7 +221,7 @@ class ReasoningEngine:
         categories_spec = json.dumps({
             k: {"gst_rate": v["gst_rate"], "keywords": v.get("keywords", [])}
             for k, v in self.specs["categories"].items()
-        }, indent=2)
+        }, separators=(',', ':'))
         
         return f"""You are FinGuru's Expense Reasoning Engine - a constrained AI system for Indian MSME accounting.
 
@@ -150,114 +272,253 @@ PRE-EXTRACTED DATE: {input_data.extracted_date or "Today"}
 Apply the accounting specification to classify this expense.
 Output your reasoning as structured JSON."""
 
-    def process(self, input_data: ReasoningInput) -> ReasoningOutput:
+    async def process(self, input_data: ReasoningInput) -> ReasoningOutput:
         """
         Process input through GPT-4.1 spec-driven reasoning.
         
         Pipeline:
-        1. Build constrained prompts with specs
-        2. Call GPT-4.1 with JSON schema enforcement
-        3. Validate output against specs
-        4. Calculate if human confirmation needed
-        5. Return structured result with explanation
+        1. Try the spec keyword rules; accept them if confident enough
+        2. Otherwise build constrained prompts with specs
+        3. Call GPT-4.1 with JSON schema enforcement
+        4. Validate output against specs
+        5. Calculate if human confirmation needed
+        6. Return structured result with explanation
         """
-        # Try GPT-4.1 first
-        if self.client:
-            try:
-                result = self._gpt_reasoning(input_data)
-                if result:
-                    return result
-            except Exception as e:
-                print(f"GPT-4.1 reasoning failed: {e}")
+        # Lowercased once for the keyword scan and the GPT cache key
+        text_lower = input_data.extracted_text.lower()
+        rule_result = self._rule_based_reasoning(input_data, text_lower)
+        if not self.client:
+            return rule_result
+        
+        # A confident rule match with an amount needs no LLM round-trip
+        if not rule_result.needs_confirmation and rule_result.amount > 0:
+            return rule_result
+        
+        try:
+            result = await self._cached_gpt_reasoning(input_data, text_lower)
+            if result:
+                return result
+        except Exception as e:
+            print(f"GPT-4.1 reasoning failed: {e}")
         
         # Fallback to rule-based reasoning
-        return self._rule_based_reasoning(input_data)
+        return rule_result
     
-    def _gpt_reasoning(self, input_data: ReasoningInput) -> Optional[ReasoningOutput]:
-        """Use GPT-4.1 as constrained reasoning engine."""
+    async def categorize_batch(self, texts: list[str]) -> list[tuple[str, float]]:
+        """
+        Categorize many expense texts, returning (category, confidence) for each.
+        
+        Texts the spec rules already handle confidently never reach GPT; the
+        rest go out BATCH_MAX_TEXTS at a time instead of one call each.
+        """
+        results = [self._categorize_by_keywords(text.lower())[:2] for text in texts]
+        if not self.client:
+            return results
+        
+        unsure = [i for i, (_, confidence) in enumerate(results) if confidence < CONFIDENCE_THRESHOLD]
+        if not unsure:
+            return results
+        
+        chunks = [unsure[i:i + BATCH_MAX_TEXTS] for i in range(0, len(unsure), BATCH_MAX_TEXTS)]
+        for answers in await asyncio.gather(*(self._categorize_chunk(texts, c) for c in chunks)):
+            for i, answer in answers.items():
+                results[i] = answer
+        return results
+    
+    async def _categorize_chunk(self, texts: list[str], indexes: list[int]) -> dict[int, tuple[str, float]]:
+        """One batched classification request for texts[i] for each i in indexes."""
+        prompt = (
+            "Categorize each expense text below. Return one result per text, "
+            "using the text's index as i.\n\n"
+            + "\n".join(f"{i}: {texts[i]}" for i in indexes)
+        )
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self._build_system_prompt()},
-                    {"role": "user", "content": self._build_user_prompt(input_data)}
+            response = await self._complete(
+                self.model_fast,
+                [
+                    {"role": "system", "content": self._system_prompt},
+                    {"role": "user", "content": prompt}
                 ],
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "expense_reasoning",
-                        "strict": True,
-                        "schema": REASONING_SCHEMA
-                    }
-                },
-                temperature=0,  # Deterministic for accounting
-                max_tokens=500
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            
-            # Get GST rate from specs based on category
-            category = result["category"]
-            gst_rate = self.specs["categories"].get(category, {}).get("gst_rate", 18)
-            amount = result["amount"]
-            gst_amount = round(amount * gst_rate / 100, 2)
-            
-            # Determine if human confirmation needed
-            confidence = result["confidence"]
-            needs_confirmation = confidence < self.settings.confidence_threshold
-            
-            confirmation_reason = None
-            if needs_confirmation:
-                if confidence < 0.7:
-                    confirmation_reason = f"Low confidence ({confidence:.0%}). {result['explanation']}"
-                else:
-                    confirmation_reason = f"Please verify: {result['rule_applied']}"
-            
-            # Build comprehensive explanation
-            explanation = (
-                f"{result['explanation']} "
-                f"Rule applied: {result['rule_applied']}. "
-                f"GST reasoning: {result['gst_reasoning']}"
-            )
-            
-            return ReasoningOutput(
-                amount=amount,
-                category=category,
-                gst_rate=gst_rate,
-                gst_amount=gst_amount,
-                confidence=confidence,
-                explanation=explanation,
-                vendor_name=input_data.extracted_vendor,
-                needs_confirmation=needs_confirmation,
-                confirmation_reason=confirmation_reason
+                schema=BATCH_CATEGORY_SCHEMA,
+                name="expense_categories",
+                max_tokens=BATCH_TOKENS_PER_TEXT * len(indexes)
             )
+        except Exception as e:
+            print(f"GPT-4.1 batch categorization failed: {e}")
+            return {}
+        
+        # Anything missing or out of range keeps its rule-based answer
+        wanted = set(indexes)
+        return {
+            item["i"]: (item["category"], item["confidence"])
+            for item in response["results"]
+            if item["i"] in wanted
+        }
+    
+    async def _cached_gpt_reasoning(
+        self,
+        input_data: ReasoningInput,
+        text_lower: str
+    ) -> Optional[ReasoningOutput]:
+        """GPT reasoning behind a small LRU keyed on the normalized input."""
+        # Case and spacing differences don't change the answer; the text is
+        # hashed so long OCR dumps don't sit in memory as cache keys
+        normalized = _WHITESPACE_RE.sub(' ', text_lower).strip()
+        key = (
+            input_data.source,
+            hashlib.blake2b(normalized.encode(), digest_size=16).digest(),
+            input_data.extracted_amount,
+            input_data.extracted_date,
+            input_data.extracted_vendor,
+            input_data.extracted_gstin
+        )
+        with self._gpt_cache_lock:
+            cached = self._gpt_cache.get(key)
+            if cached is not None:
+                self._gpt_cache.move_to_end(key)
+                return cached.model_copy()
+        
+        result = await self._gpt_reasoning(input_data)
+        if result is None:
+            # Failures are not cached so the next upload retries
+            return None
+        
+        with self._gpt_cache_lock:
+            self._gpt_cache[key] = result
+            if len(self._gpt_cache) > GPT_CACHE_SIZE:
+                self._gpt_cache.popitem(last=False)
+        return result.model_copy()
+    
+    async def _gpt_reasoning(self, input_data: ReasoningInput) -> Optional[ReasoningOutput]:
+        """Use GPT-4.1 as constrained reasoning engine."""
+        try:
+            messages = self._build_messages(input_data)
+            result = await self._complete(self.model_fast, messages)
+            if result["confidence"] < ESCALATION_CONFIDENCE:
+                result = await self._complete(self.model, messages)
+            return self.to_output(result, input_data)
             
         except Exception as e:
             print(f"GPT-4.1 error: {e}")
             return None
     
-    def _rule_based_reasoning(self, input_data: ReasoningInput) -> ReasoningOutput:
-        """Fallback rule-based reasoning when GPT-4.1 unavailable."""
-        text = input_data.extracted_text.lower()
+    def _build_messages(self, input_data: ReasoningInput) -> list[dict]:
+        """Build the chat messages for one reasoning request."""
+        return [
+            {"role": "system", "content": self._system_prompt},
+            {"role": "user", "content": self._build_user_prompt(input_data)}
+        ]
+    
+    def to_output(self, result: dict, input_data: ReasoningInput) -> ReasoningOutput:
+        """Turn a schema-constrained GPT result into a ReasoningOutput."""
+        # Get GST rate from specs based on category
+        category = result["category"]
+        gst_rate = self._category_gst.get(category, 18)
+        amount = result["amount"]
+        gst_amount = round(amount * gst_rate / 100, 2)
+        
+        # Determine if human confirmation needed
+        confidence = result["confidence"]
+        needs_confirmation = confidence < CONFIDENCE_THRESHOLD
         
+        confirmation_reason = None
+        if needs_confirmation:
+            if confidence < LOW_CONFIDENCE:
+                confirmation_reason = f"Low confidence ({confidence:.0%}). {result['explanation']}"
+            else:
+                confirmation_reason = f"Please verify: {result['rule_applied']}"
+        
+        # Build comprehensive explanation
+        explanation = (
+            f"{result['explanation']} "
+            f"Rule applied: {result['rule_applied']}. "
+            f"GST reasoning: {result['gst_reasoning']}"
+        )
+        
+        return ReasoningOutput(
+            amount=amount,
+            category=category,
+            gst_rate=gst_rate,
+            gst_amount=gst_amount,
+            confidence=confidence,
+            explanation=explanation,
+            vendor_name=input_data.extracted_vendor,
+            needs_confirmation=needs_confirmation,
+            confirmation_reason=confirmation_reason
+        )
+    
+    def request_body(self, input_data: ReasoningInput, model: Optional[str] = None) -> dict:
+        """Chat completion parameters for one input, e.g. as a Batch API line."""
+        return self._completion_body(model or self.model, self._build_messages(input_data))
+    
+    async def _complete(
+        self,
+        model: str,
+        messages: list[dict],
+        schema: dict = REASONING_SCHEMA,
+        name: str = "expense_reasoning",
+        max_tokens: int = GPT_MAX_TOKENS
+    ) -> dict:
+        """Run one schema-constrained completion and parse its JSON."""
+        body = self._completion_body(model, messages, schema, name, max_tokens)
+        async with self._llm_slots:
+            response = await self.client.chat.completions.create(**body)
+        return json.loads(response.choices[0].message.content)
+    
+    def _completion_body(
+        self,
+        model: str,
+        messages: list[dict],
+        schema: dict = REASONING_SCHEMA,
+        name: str = "expense_reasoning",
+        max_tokens: int = GPT_MAX_TOKENS
+    ) -> dict:
+        """Chat completion parameters with the JSON schema enforced."""
+        return {
+            "model": model,
+            "messages": messages,
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": name,
+                    "strict": True,
+                    "schema": schema
+                }
+            },
+            "temperature": 0,  # Deterministic for accounting
+            "max_tokens": max_tokens
+        }
+    
+    def _rule_based_reasoning(self, input_data: ReasoningInput, text_lower: str) -> ReasoningOutput:
+        """Fallback rule-based reasoning when GPT-4.1 unavailable."""
         # Extract amount
-        amount = input_data.extracted_amount or self._extract_amount(text)
+        amount = input_data.extracted_amount or self._extract_amount(text_lower)
         
-        # Categorize using keywords
-        category, confidence = self._categorize_by_keywords(text)
+        # A known vendor decides the category; otherwise use keywords
+        vendor_category = self._categorize_by_vendor(input_data.extracted_vendor)
+        if vendor_category:
+            category, confidence, keywords = vendor_category, VENDOR_CONFIDENCE, []
+        else:
+            category, confidence, keywords = self._categorize_by_keywords(text_lower)
         
         # Get GST from specs
-        gst_rate = self.specs["categories"].get(category, {}).get("gst_rate", 18)
+        gst_rate = self._category_gst.get(category, 18)
         gst_amount = round((amount or 0) * gst_rate / 100, 2)
         
         # Build explanation
         cat_display = self.specs["categories"].get(category, {}).get("display_name", category)
+        if vendor_category:
+            basis = f"vendor '{input_data.extracted_vendor}'"
+        elif keywords:
+            basis = "keyword matching (matched " + ", ".join(f"'{kw}'" for kw in keywords) + ")"
+        else:
+            basis = "keyword matching"
         explanation = (
-            f"Categorized as '{cat_display}' based on keyword matching. "
+            f"Categorized as '{cat_display}' based on {basis}. "
             f"GST rate of {gst_rate}% applied per Indian GST rules for {cat_display.lower()}."
         )
         
-        needs_confirmation = confidence < self.settings.confidence_threshold
+        needs_confirmation = confidence < CONFIDENCE_THRESHOLD
         confirmation_reason = None
         if needs_confirmation:
             confirmation_reason = "Rule-based classification has lower confidence. Please verify."
@@ -275,13 +536,9 @@ Output your reasoning as structured JSON."""
         )
     
     def _extract_amount(self, text: str) -> Optional[float]:
-        """Extract amount using spec-defined patterns."""
-        patterns = self.specs['validation']['amount_patterns']
-        
-        for pattern_def in patterns:
-            pattern = pattern_def['pattern']
-            group = pattern_def['group']
-            match = re.search(pattern, text.lower())
+        """Extract amount using spec-defined patterns (case-insensitive)."""
+        for pattern, group in self._amount_patterns:
+            match = pattern.search(text)
             if match:
                 try:
                     amount_str = match.group(group).replace(',', '')
@@ -290,7 +547,7 @@ Output your reasoning as structured JSON."""
                     continue
         
         # Fallback: find reasonable numbers
-        numbers = re.findall(r'\b(\d{1,6}(?:\.\d{2})?)\b', text)
+        numbers = _FALLBACK_AMOUNT_RE.findall(text)
         if numbers:
             amounts = [float(n) for n in numbers if 1 <= float(n) <= 100000]
             if amounts:
@@ -298,22 +555,60 @@ Output your reasoning as structured JSON."""
         
         return None
     
-    def _categorize_by_keywords(self, text: str) -> tuple[str, float]:
-        """Categorize using spec-defined keywords."""
+    def _categorize_by_vendor(self, vendor: Optional[str]) -> Optional[str]:
+        """
+        Category for a known vendor.
+        
+        The whole name must match an alias once company suffixes are dropped,
+        so "Uber India Systems Pvt. Ltd." is Uber but "Jio Mart" is not Jio.
+        """
+        if not vendor or not self._vendor_categories:
+            return None
+        return self._vendor_categories.get(self._vendor_key(vendor))
+    
+    @staticmethod
+    def _vendor_key(name: str) -> str:
+        """Normalize a vendor name: lowercase words, company suffixes dropped"""
+        words = _VENDOR_WORD_RE.findall(name.lower().replace("'", ""))
+        while len(words) > 1 and words[-1] in VENDOR_NAME_SUFFIXES:
+            words.pop()
+        return " ".join(words)
+    
+    def _categorize_by_keywords(self, text: str) -> tuple[str, float, list[str]]:
+        """
+        Categorize using spec-defined keywords.
+        
+        Also returns the winning category's keywords in the order they appear
+        in the text, so the explanation can cite them without another scan.
+        """
         best_category = 'miscellaneous'
         best_score = 0
         
-        for cat_key, cat_data in self.specs['categories'].items():
-            keywords = cat_data.get('keywords', [])
-            matches = sum(1 for kw in keywords if kw in text)
-            
-            if matches > best_score:
-                best_score = matches
+        # One pass over the text; each distinct keyword counts once per category.
+        # dict.fromkeys dedupes while keeping first-match order.
+        matched = dict.fromkeys(value for _, value in self._keyword_automaton.iter(text))
+        counts = Counter(cat for _, categories in matched for cat in categories)
+        
+        for cat_key in self.specs['categories']:
+            if counts[cat_key] > best_score:
+                best_score = counts[cat_key]
                 best_category = cat_key
         
-        confidence = min(0.85, 0.5 + (best_score * 0.15))
-        return best_category, confidence
+        confidence = min(KEYWORD_MAX_CONFIDENCE, KEYWORD_BASE_CONFIDENCE + best_score * KEYWORD_MATCH_CONFIDENCE)
+        keywords = [kw for kw, categories in matched if best_category in categories]
+        return best_category, confidence, keywords
 
 
 # Singleton instance
 reasoning_engine = ReasoningEngine()
+
+# Derived from the (immutable) categories spec once at import
+CATEGORY_GST_RATE: dict[str, float] = reasoning_engine._category_gst
+CATEGORIES_LIST: list[dict] = [
+    {
+        "key": k,
+        "display_name": v.get('display_name', k),
+        "gst_rate": v.get('gst_rate', 18)
+    }
+    for k, v in reasoning_engine.specs['categories'].items()
+]
@@ -1,83 +1,141 @@
 """Amazon S3 service for file storage"""
-import boto3
+import tempfile
+import time
+from boto3.s3.transfer import TransferConfig
+from typing import BinaryIO
 from uuid import uuid4
-from datetime import datetime
-from config import get_settings
+from datetime import datetime, timezone
+from config import S3_BUCKET
+from services.aws import session, BOTO_CONFIG
+
+# Stream uploads in 8 MB parts with a short read-ahead queue to bound memory
+STREAM_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_io_queue=2
+)
+
+# Downloads above this size spill from memory to a temp file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Presigned view URLs are reused until this many seconds before they expire
+PRESIGNED_URL_MARGIN = 300
+PRESIGNED_CACHE_MAX = 4096
+
+
+class _KeepOpenFile:
+    """File proxy that ignores close(), since upload_fileobj closes its input"""
+    
+    def __init__(self, fileobj: BinaryIO):
+        self._fileobj = fileobj
+    
+    def __getattr__(self, name):
+        return getattr(self._fileobj, name)
+    
+    def close(self):
+        pass
 
 
 class S3Service:
     """Handle S3 operations for receipts and audio files"""
     
+    # File extension for each content type we store; the transcription API
+    # picks the audio format from it, so every accepted audio type is listed
+    _EXT_MAP = {
+        'image/jpeg': '.jpg',
+        'image/png': '.png',
+        'image/webp': '.webp',
+        'audio/webm': '.webm',
+        'audio/mp3': '.mp3',
+        'audio/mpeg': '.mp3',
+        'audio/wav': '.wav',
+        'audio/ogg': '.ogg',
+        'audio/mp4': '.m4a',
+        'audio/m4a': '.m4a',
+        'audio/x-m4a': '.m4a',
+        # Browser AAC recordings come in an MP4 container, and Whisper
+        # rejects a bare .aac name
+        'audio/aac': '.m4a',
+        'audio/flac': '.flac',
+        'video/webm': '.webm',
+    }
+    
     def __init__(self):
-        settings = get_settings()
-        self.s3 = boto3.client(
-            's3',
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region
-        )
-        self.bucket = settings.s3_bucket_name
+        self.s3 = session.client('s3', config=BOTO_CONFIG)
+        self.bucket = S3_BUCKET
+        # (bucket, key, expiration) -> (reuse deadline, url)
+        self._presigned_cache: dict[tuple, tuple[float, str]] = {}
     
-    def upload_receipt(self, file_content: bytes, content_type: str) -> str:
-        """Upload receipt image to S3"""
-        date_prefix = datetime.utcnow().strftime("%Y/%m/%d")
-        file_id = str(uuid4())
-        extension = self._get_extension(content_type)
-        key = f"receipts/{date_prefix}/{file_id}{extension}"
+    def upload_stream(self, fileobj: BinaryIO, content_type: str, prefix: str = "audio") -> str:
+        """Stream a file object to S3 without reading it fully into memory"""
+        key = self._new_key(prefix, content_type)
         
-        self.s3.put_object(
-            Bucket=self.bucket,
-            Key=key,
-            Body=file_content,
-            ContentType=content_type,
-            ServerSideEncryption='AES256'
+        self.s3.upload_fileobj(
+            _KeepOpenFile(fileobj),
+            self.bucket,
+            key,
+            ExtraArgs={'ContentType': content_type, 'ServerSideEncryption': 'AES256'},
+            Config=STREAM_TRANSFER_CONFIG
         )
         
         return f"s3://{self.bucket}/{key}"
     
-    def upload_audio(self, file_content: bytes, content_type: str) -> str:
-        """Upload audio file to S3"""
-        date_prefix = datetime.utcnow().strftime("%Y/%m/%d")
-        file_id = str(uuid4())
-        extension = self._get_extension(content_type)
-        key = f"audio/{date_prefix}/{file_id}{extension}"
+    def create_upload_url(self, content_type: str, prefix: str = "audio", expiration: int = 300) -> dict:
+        """Presign a PUT so the client can upload straight to S3"""
+        key = self._new_key(prefix, content_type)
         
-        self.s3.put_object(
-            Bucket=self.bucket,
-            Key=key,
-            Body=file_content,
-            ContentType=content_type,
-            ServerSideEncryption='AES256'
+        # Objects are encrypted by the bucket's default SSE-S3, so the client
+        # only has to send the Content-Type it asked for
+        url = self.s3.generate_presigned_url(
+            'put_object',
+            Params={'Bucket': self.bucket, 'Key': key, 'ContentType': content_type},
+            ExpiresIn=expiration
         )
-        
-        return f"s3://{self.bucket}/{key}"
+        return {"key": key, "url": url}
+    
+    def get_object_size(self, key: str) -> int:
+        """Size in bytes of an object in the uploads bucket"""
+        return self.s3.head_object(Bucket=self.bucket, Key=key)['ContentLength']
+    
+    def download_stream(self, key: str) -> BinaryIO:
+        """Fetch an object into a spooled temp file, rewound for reading"""
+        fileobj = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.s3.download_fileobj(self.bucket, key, fileobj, Config=STREAM_TRANSFER_CONFIG)
+        fileobj.seek(0)
+        return fileobj
     
     def get_presigned_url(self, s3_uri: str, expiration: int = 3600) -> str:
-        """Generate presigned URL for viewing"""
+        """Generate presigned URL for viewing, reusing a recent one for the same object"""
         # Parse s3://bucket/key format
-        parts = s3_uri.replace("s3://", "").split("/", 1)
-        bucket = parts[0]
-        key = parts[1] if len(parts) > 1 else ""
+        bucket, _, key = s3_uri.removeprefix("s3://").partition("/")
         
-        return self.s3.generate_presigned_url(
+        cache_key = (bucket, key, expiration)
+        now = time.monotonic()
+        cached = self._presigned_cache.get(cache_key)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        url = self.s3.generate_presigned_url(
             'get_object',
             Params={'Bucket': bucket, 'Key': key},
             ExpiresIn=expiration
         )
+        
+        ttl = expiration - PRESIGNED_URL_MARGIN
+        if ttl > 0:
+            if len(self._presigned_cache) >= PRESIGNED_CACHE_MAX:
+                for k in [k for k, (deadline, _) in self._presigned_cache.items() if deadline <= now]:
+                    self._presigned_cache.pop(k, None)
+                if len(self._presigned_cache) >= PRESIGNED_CACHE_MAX:
+                    # Still full - drop the oldest insertion
+                    self._presigned_cache.pop(next(iter(self._presigned_cache)), None)
+            self._presigned_cache[cache_key] = (now + ttl, url)
+        return url
     
-    def _get_extension(self, content_type: str) -> str:
-        """Get file extension from content type"""
-        mapping = {
-            'image/jpeg': '.jpg',
-            'image/png': '.png',
-            'image/webp': '.webp',
-            'audio/webm': '.webm',
-            'audio/mp3': '.mp3',
-            'audio/mpeg': '.mp3',
-            'audio/wav': '.wav',
-            'audio/ogg': '.ogg',
-        }
-        return mapping.get(content_type, '.bin')
+    def _new_key(self, prefix: str, content_type: str) -> str:
+        """Fresh date-partitioned object key, e.g. audio/2025/01/31/<hex>.webm"""
+        extension = self._EXT_MAP.get(content_type, '.bin')
+        return f"{prefix}/{datetime.now(timezone.utc):%Y/%m/%d}/{uuid4().hex}{extension}"
 
 
 # Singleton instance
@@ -1,12 +1,81 @@
 """OCR service for receipt scanning - using OpenAI Vision API"""
+import asyncio
 import base64
-import re
+import io
 import json
-from typing import Optional
-from openai import OpenAI
+from typing import BinaryIO, Optional
+from PIL import Image, ImageOps
 from config import get_settings
+from services._openai_client import get_openai_client, get_openrouter_client
 from models.schemas import ReceiptExtraction
 
+# Vision models work at about this resolution, so larger photos only add
+# upload time and image tokens
+VISION_MAX_SIDE = 1024
+VISION_JPEG_QUALITY = 80
+
+# Structured output schema for receipt extraction
+RECEIPT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "raw_text": {
+            "type": "string",
+            "description": "Key receipt lines (vendor, line items, totals), at most 600 characters"
+        },
+        "amount": {
+            "type": ["number", "null"],
+            "description": "Total/grand total as a number, no currency symbol"
+        },
+        "date": {
+            "type": ["string", "null"],
+            "description": "Date in YYYY-MM-DD format"
+        },
+        "vendor_name": {
+            "type": ["string", "null"],
+            "description": "Store/vendor name"
+        },
+        "vendor_gstin": {
+            "type": ["string", "null"],
+            "description": "GSTIN: 2 digits + 10 char PAN + 1 digit + Z + 1 alphanumeric"
+        },
+        "items": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Names of items purchased, at most 15"
+        }
+    },
+    "required": ["raw_text", "amount", "date", "vendor_name", "vendor_gstin", "items"],
+    "additionalProperties": False
+}
+
+# Output budget for one receipt; raw_text and items are bounded in the
+# schema so a filled-in reply fits well under it
+RECEIPT_MAX_TOKENS = 800
+
+
+class ReceiptTooLongError(Exception):
+    """The model ran out of output tokens before finishing the receipt JSON"""
+
+
+def _shrink_image(image_file: BinaryIO, content_type: str) -> tuple[bytes, str]:
+    """Read a receipt photo, downscaled to VISION_MAX_SIDE and re-encoded as JPEG"""
+    image = image_file.read()
+    try:
+        img = Image.open(io.BytesIO(image))
+        if max(img.size) <= VISION_MAX_SIDE:
+            return image, content_type
+        # Let the JPEG decoder skip detail that the resize would throw away
+        img.draft('RGB', (VISION_MAX_SIDE, VISION_MAX_SIDE))
+        # Phone cameras store rotation in EXIF; apply it before it's dropped
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((VISION_MAX_SIDE, VISION_MAX_SIDE), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.convert('RGB').save(buf, 'JPEG', quality=VISION_JPEG_QUALITY, optimize=True)
+        return buf.getvalue(), 'image/jpeg'
+    except Exception as e:
+        print(f"Image downscale failed (sending original): {e}")
+        return image, content_type
+
 
 class TextractService:
     """Handle OCR operations for receipt scanning using OpenAI Vision"""
@@ -15,70 +84,86 @@ class TextractService:
         settings = get_settings()
         # Use OpenRouter or OpenAI
         if settings.openrouter_api_key:
-            self.client = OpenAI(
-                api_key=settings.openrouter_api_key,
-                base_url="https://openrouter.ai/api/v1"
-            )
+            self.client = get_openrouter_client()
             self.model = "google/gemini-2.0-flash-001"
         elif settings.openai_api_key:
-            self.client = OpenAI(api_key=settings.openai_api_key)
+            self.client = get_openai_client()
             self.model = "gpt-4o-mini"
         else:
             self.client = None
+        self._llm_slots = asyncio.Semaphore(settings.openai_max_concurrency)
     
-    def extract_receipt(self, image_bytes: bytes) -> ReceiptExtraction:
-        """Extract text and structured data from receipt image using Vision API"""
+    async def extract_receipt(self, image_file: BinaryIO, content_type: str = "image/jpeg") -> ReceiptExtraction:
+        """
+        Extract text and structured data from a receipt image file using Vision API.
+        
+        Raises ReceiptTooLongError if the reply was cut off at RECEIPT_MAX_TOKENS.
+        """
         
         if not self.client:
             return ReceiptExtraction(raw_text="", confidence=0.0)
         
-        # Convert image to base64
-        base64_image = base64.b64encode(image_bytes).decode('utf-8')
+        # Reading a spooled upload and resizing both block, so keep them off
+        # the event loop
+        image, content_type = await asyncio.to_thread(_shrink_image, image_file, content_type)
+        base64_image = base64.b64encode(image).decode('utf-8')
+        
+        prompt = (
+            "Extract the receipt details from this image. "
+            "Use null for any field that is not visible. Keep raw_text to the "
+            "key lines (vendor, items, totals), at most 600 characters, and "
+            "list at most 15 items."
+        )
         
-        prompt = """Analyze this receipt image and extract the following information in JSON format:
-{
-    "raw_text": "full text from receipt",
-    "amount": total amount as number (just the number, no currency symbol),
-    "date": "date in YYYY-MM-DD format if visible",
-    "vendor_name": "store/vendor name",
-    "vendor_gstin": "GST number if visible (format: 2 digits + 10 char PAN + 1 digit + Z + 1 alphanumeric)",
-    "items": ["list of items purchased"]
-}
-
-If any field is not visible, use null. For amount, extract the total/grand total."""
-
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=1000
-            )
+            async with self._llm_slots:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [
+                                {"type": "text", "text": prompt},
+                                {
+                                    "type": "image_url",
+                                    "image_url": {"url": f"data:{content_type};base64,{base64_image}"}
+                                }
+                            ]
+                        }
+                    ],
+                    response_format={
+                        "type": "json_schema",
+                        "json_schema": {
+                            "name": "receipt",
+                            "strict": True,
+                            "schema": RECEIPT_SCHEMA
+                        }
+                    },
+                    temperature=0,
+                    max_tokens=RECEIPT_MAX_TOKENS
+                )
             
-            result_text = response.choices[0].message.content
-            # Extract JSON from response
-            json_match = re.search(r'\{[\s\S]*\}', result_text)
-            if json_match:
-                data = json.loads(json_match.group())
-                return ReceiptExtraction(
-                    raw_text=data.get('raw_text', ''),
-                    amount=float(data['amount']) if data.get('amount') else None,
-                    date=data.get('date'),
-                    vendor_name=data.get('vendor_name'),
-                    vendor_gstin=data.get('vendor_gstin'),
-                    items=data.get('items', []),
-                    confidence=0.85
+            # A cut-off reply is incomplete JSON; report it as its own error
+            choice = response.choices[0]
+            if choice.finish_reason == "length":
+                raise ReceiptTooLongError(
+                    "This receipt has too much text to read in one go. "
+                    "Please photograph just the totals section."
                 )
+            
+            # The schema guarantees a single JSON object
+            data = json.loads(choice.message.content)
+            return ReceiptExtraction(
+                raw_text=data['raw_text'],
+                amount=float(data['amount']) if data['amount'] else None,
+                date=data['date'],
+                vendor_name=data['vendor_name'],
+                vendor_gstin=data['vendor_gstin'],
+                items=data['items'],
+                confidence=0.85
+            )
+        except ReceiptTooLongError:
+            raise
         except Exception as e:
             print(f"Vision API error: {e}")
         
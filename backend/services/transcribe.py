@@ -1,61 +1,137 @@
 """
-Whisper Transcription Service using OpenAI API
-For cloud deployment - uses OpenAI's Whisper API instead of local model
+Whisper Transcription Service
+Uses a local faster-whisper (CTranslate2, INT8) model when WHISPER_MODEL is
+set, otherwise OpenAI's Whisper API for cloud deployment
 """
+import asyncio
+import math
 import os
-import tempfile
+import threading
 from dataclasses import dataclass
-from openai import OpenAI
+from typing import BinaryIO
 from config import get_settings
+from services._openai_client import get_openai_client
 
 settings = get_settings()
 
+# Set once the startup preload has finished (successfully or not)
+model_ready = threading.Event()
+
+# Silero VAD settings for the local pipeline; blips shorter than
+# min_speech_duration_ms are not treated as speech
+VAD_PARAMETERS = {"min_speech_duration_ms": 250, "min_silence_duration_ms": 160}
+
 
 @dataclass
 class TranscriptionResult:
     """Result from transcription service."""
     raw_text: str
     confidence: float
+    speech_detected: bool = True
 
 
 class TranscribeService:
-    """Whisper transcription service using OpenAI API."""
+    """Whisper transcription service (local faster-whisper or OpenAI API)."""
     
     def __init__(self):
-        self.client = None
-        if settings.openai_api_key:
-            self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = get_openai_client()
+        # Local faster-whisper model and its batched pipeline, loaded by load_model()
+        self.model = None
+        self.pipeline = None
+        self._load_lock = threading.Lock()
+    
+    def load_model(self):
+        """Load the local faster-whisper model if one is configured."""
+        if not settings.whisper_model or self.model is not None:
+            return
+        with self._load_lock:
+            if self.model is None:
+                from faster_whisper import BatchedInferencePipeline, WhisperModel
+                model = WhisperModel(
+                    settings.whisper_model,
+                    device="cpu",
+                    compute_type=settings.whisper_compute_type,
+                    cpu_threads=settings.whisper_cpu_threads,
+                    num_workers=settings.whisper_num_workers
+                )
+                self.pipeline = BatchedInferencePipeline(model)
+                self.model = model
+    
+    def warmup(self):
+        """Decode one second of silence so the first real request runs warm."""
+        if self.model is None:
+            return
+        import numpy as np
+        segments, _ = self.model.transcribe(np.zeros(16000, dtype=np.float32), language="hi")
+        # Segments are generated lazily; consume them to run the decoder
+        list(segments)
     
-    def transcribe_audio(self, audio_bytes: bytes, filename: str = "audio.webm") -> TranscriptionResult:
+    async def transcribe_audio(self, audio_file: BinaryIO, filename: str = "audio.webm") -> TranscriptionResult:
         """
-        Transcribe audio from bytes using OpenAI's Whisper API.
+        Transcribe an audio file object without blocking the event loop.
         
         Args:
-            audio_bytes: Raw audio data
+            audio_file: Readable binary file positioned at the start of the audio
             filename: Original filename (for format detection)
             
         Returns:
             TranscriptionResult with text and confidence
         """
+        if settings.whisper_model:
+            return await asyncio.to_thread(self._transcribe_local, audio_file)
+        return await self._transcribe_api(audio_file, filename)
+    
+    def _transcribe_local(self, audio_file: BinaryIO) -> TranscriptionResult:
+        """Transcribe with the local INT8 faster-whisper model.
+        
+        The batched pipeline runs Silero VAD first, so silence is never
+        decoded, then decodes up to whisper_batch_size speech chunks in one
+        forward pass.
+        """
+        self.load_model()
+        try:
+            segments, info = self.pipeline.transcribe(
+                audio_file,
+                language="hi",
+                batch_size=settings.whisper_batch_size,
+                vad_filter=True,
+                vad_parameters=VAD_PARAMETERS
+            )
+            if not info.duration_after_vad:
+                # Nothing but silence - skip the decoder entirely
+                return TranscriptionResult(raw_text="", confidence=0.0, speech_detected=False)
+            segments = list(segments)
+        except Exception as e:
+            print(f"Local Whisper error: {e}")
+            raise RuntimeError(f"Transcription failed: {str(e)}")
+        
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            return TranscriptionResult(raw_text="", confidence=0.0)
+        
+        # Mean per-token probability of the decoded text, from each segment's
+        # average log-probability
+        confidence = sum(math.exp(segment.avg_logprob) for segment in segments) / len(segments)
+        return TranscriptionResult(raw_text=text, confidence=round(confidence, 2))
+    
+    async def _transcribe_api(self, audio_file: BinaryIO, filename: str) -> TranscriptionResult:
+        """Transcribe with OpenAI's Whisper API."""
         if not self.client:
             raise RuntimeError("OpenAI API key not configured")
         
-        # Determine file extension
-        ext = os.path.splitext(filename)[1] or ".webm"
-        
-        # Write to temp file
-        with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-            tmp.write(audio_bytes)
-            tmp_path = tmp.name
+        # The API detects the format from the filename's extension
+        if not os.path.splitext(filename)[1]:
+            filename += ".webm"
         
         try:
-            with open(tmp_path, "rb") as audio_file:
-                transcript = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="hi",  # Hindi/Hinglish
-                    response_format="text"
-                )
+            # The SDK reads the upload straight from the file object, so the
+            # audio never round-trips through a temp file on disk
+            transcript = await self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=(filename, audio_file),
+                language="hi",  # Hindi/Hinglish
+                response_format="text"
+            )
             
             text = transcript.strip() if transcript else ""
             # OpenAI Whisper API doesn't return confidence, assume high confidence
@@ -66,18 +142,20 @@ class TranscribeService:
         except Exception as e:
             print(f"Whisper API error: {e}")
             raise RuntimeError(f"Transcription failed: {str(e)}")
-        
-        finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
 
 
 # Global instance
 transcribe_service = TranscribeService()
-client = transcribe_service.client
 
 
 def preload_model():
-    """No-op for API-based Whisper - no model to preload"""
-    print("Using OpenAI Whisper API (cloud-based)")
+    """Load the local Whisper model; no-op for API-based Whisper"""
+    try:
+        if settings.whisper_model:
+            print(f"Loading local Whisper model '{settings.whisper_model}' ({settings.whisper_compute_type})")
+            transcribe_service.load_model()
+            transcribe_service.warmup()
+        else:
+            print("Using OpenAI Whisper API (cloud-based)")
+    finally:
+        model_ready.set()
@@ -0,0 +1,269 @@
+"""Summary view, confirmation retries and save batching against a stubbed table"""
+import asyncio
+from decimal import Decimal
+import pytest
+from botocore.exceptions import ClientError
+from models.schemas import LedgerEntry
+from services.dynamodb import (
+    DynamoDBService, EntrySaveBatcher, SUMMARY_KEY, CONFIRM_ATTEMPTS, CONFIRMED_SUFFIX
+)
+
+
+def conditional_check_failed(operation: str) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}},
+        operation
+    )
+
+
+class StubTable:
+    """Records calls and replays scripted responses; scripted exceptions are raised"""
+    
+    def __init__(self, update=(), put=(), scan=(), get=()):
+        self.scripts = {
+            "update_item": list(update),
+            "put_item": list(put),
+            "scan": list(scan),
+            "get_item": list(get)
+        }
+        self.calls = {name: [] for name in self.scripts}
+    
+    def _call(self, name, kwargs):
+        self.calls[name].append(kwargs)
+        result = self.scripts[name].pop(0) if self.scripts[name] else {}
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    def update_item(self, **kwargs):
+        return self._call("update_item", kwargs)
+    
+    def put_item(self, **kwargs):
+        return self._call("put_item", kwargs)
+    
+    def scan(self, **kwargs):
+        return self._call("scan", kwargs)
+    
+    def get_item(self, **kwargs):
+        return self._call("get_item", kwargs)
+
+
+def make_service(table: StubTable) -> DynamoDBService:
+    service = DynamoDBService()
+    service.table = table
+    return service
+
+
+def added_values(call: dict) -> dict:
+    """Attribute name -> value of an ADD update"""
+    names = call["ExpressionAttributeNames"]
+    values = call["ExpressionAttributeValues"]
+    return {names[f"#a{i}"]: values[f":a{i}"] for i in range(len(names))}
+
+
+def make_entry(**overrides) -> LedgerEntry:
+    fields = dict(
+        date="2025-01-31", amount=100, category="food", gst_rate=5, gst_amount=5,
+        source="voice", confidence=0.9, explanation="Lunch at a restaurant"
+    )
+    fields.update(overrides)
+    return LedgerEntry(**fields)
+
+
+def test_summary_deltas_are_added_in_one_update():
+    table = StubTable()
+    service = make_service(table)
+    
+    service._apply_summary_deltas([
+        service._summary_delta({"category": "food", "amount": Decimal("100"), "gst_amount": Decimal("5")}, sign=1),
+        service._summary_delta({"category": "food", "amount": Decimal("40"), "gst_amount": Decimal("2")}, sign=-1),
+        service._summary_delta({"category": "transport", "amount": Decimal("60"), "gst_amount": Decimal("3")}, sign=1)
+    ])
+    
+    [call] = table.calls["update_item"]
+    assert call["Key"] == {"transaction_id": SUMMARY_KEY}
+    assert call["ConditionExpression"] == "attribute_exists(transaction_id)"
+    assert call["UpdateExpression"].startswith("ADD ")
+    assert added_values(call) == {
+        "total_amount": Decimal("120"),
+        "total_gst": Decimal("6"),
+        "entry_count": 1,
+        "amount:food": Decimal("60"),
+        "gst:food": Decimal("3"),
+        "amount:transport": Decimal("60"),
+        "gst:transport": Decimal("3")
+    }
+    assert not table.calls["put_item"]
+
+
+def test_missing_summary_is_created_from_a_consistent_scan():
+    table = StubTable(
+        update=[conditional_check_failed("UpdateItem")],
+        scan=[
+            {"Items": [
+                {"transaction_id": "a", "category": "food", "amount": Decimal("100"), "gst_amount": Decimal("5")},
+                {"transaction_id": SUMMARY_KEY, "total_amount": Decimal("0")}
+            ], "LastEvaluatedKey": {"transaction_id": SUMMARY_KEY}},
+            {"Items": [
+                {"transaction_id": "b", "category": "transport", "amount": Decimal("50"), "gst_amount": Decimal("0")}
+            ]}
+        ]
+    )
+    service = make_service(table)
+    
+    service._apply_summary_deltas([
+        service._summary_delta({"category": "transport", "amount": Decimal("50"), "gst_amount": Decimal("0")}, sign=1)
+    ])
+    
+    assert all(call["ConsistentRead"] for call in table.calls["scan"])
+    assert table.calls["scan"][1]["ExclusiveStartKey"] == {"transaction_id": SUMMARY_KEY}
+    [put] = table.calls["put_item"]
+    assert put["ConditionExpression"] == "attribute_not_exists(transaction_id)"
+    assert put["Item"] == {
+        "transaction_id": SUMMARY_KEY,
+        "total_amount": Decimal("150"),
+        "total_gst": Decimal("5"),
+        "entry_count": 2,
+        "amount:food": Decimal("100"),
+        "gst:food": Decimal("5"),
+        "amount:transport": Decimal("50"),
+        "gst:transport": Decimal("0")
+    }
+    # The scan already counted this write
+    assert len(table.calls["update_item"]) == 1
+
+
+def test_summary_created_concurrently_gets_the_add_retried():
+    table = StubTable(
+        update=[conditional_check_failed("UpdateItem"), {}],
+        put=[conditional_check_failed("PutItem")],
+        scan=[{"Items": []}]
+    )
+    service = make_service(table)
+    
+    service._apply_summary_deltas([
+        service._summary_delta({"category": "food", "amount": Decimal("100"), "gst_amount": Decimal("5")}, sign=1)
+    ])
+    
+    first, retry = table.calls["update_item"]
+    assert retry == first
+
+
+def test_backfill_rebuild_replaces_the_summary():
+    table = StubTable(scan=[{"Items": []}])
+    service = make_service(table)
+    
+    summary = service._rebuild_summary(replace=True)
+    
+    [put] = table.calls["put_item"]
+    assert "ConditionExpression" not in put
+    assert summary["entry_count"] == 0
+
+
+CURRENT = {
+    "amount": Decimal("100"),
+    "gst_rate": Decimal("5"),
+    "explanation": "Lunch at a restaurant"
+}
+
+
+def test_confirm_entry_recomputes_gst_and_marks_confirmed(monkeypatch):
+    table = StubTable(get=[{"Item": dict(CURRENT)}])
+    service = make_service(table)
+    updates = []
+    
+    def fake_update(transaction_id, changes, expected=None):
+        updates.append((transaction_id, changes, expected))
+        return make_entry(transaction_id=transaction_id)
+    
+    monkeypatch.setattr(service, "update_entry", fake_update)
+    entry = service.confirm_entry("tx-1", amount=250, category="office_supplies", gst_rate=18)
+    
+    assert entry.transaction_id == "tx-1"
+    assert table.calls["get_item"][0]["ConsistentRead"] is True
+    [(transaction_id, changes, expected)] = updates
+    assert transaction_id == "tx-1"
+    assert expected == CURRENT
+    assert changes == {
+        "amount": Decimal("250"),
+        "category": "office_supplies",
+        "gst_rate": Decimal("18"),
+        "gst_amount": Decimal("45.00"),
+        "confidence": Decimal("1.0"),
+        "explanation": "Lunch at a restaurant" + CONFIRMED_SUFFIX
+    }
+
+
+def test_confirm_entry_rereads_after_a_concurrent_update(monkeypatch):
+    changed = {**CURRENT, "explanation": "Edited meanwhile"}
+    table = StubTable(get=[{"Item": dict(CURRENT)}, {"Item": changed}])
+    service = make_service(table)
+    expectations = []
+    
+    def fake_update(transaction_id, changes, expected=None):
+        expectations.append(expected)
+        # The first write loses the race
+        return make_entry() if len(expectations) > 1 else None
+    
+    monkeypatch.setattr(service, "update_entry", fake_update)
+    assert service.confirm_entry("tx-1") is not None
+    assert expectations == [CURRENT, changed]
+
+
+def test_confirm_entry_gives_up_after_repeated_races(monkeypatch):
+    table = StubTable(get=[{"Item": dict(CURRENT)} for _ in range(CONFIRM_ATTEMPTS)])
+    service = make_service(table)
+    monkeypatch.setattr(service, "update_entry", lambda *args, **kwargs: None)
+    
+    with pytest.raises(RuntimeError, match="concurrently"):
+        service.confirm_entry("tx-1")
+    assert len(table.calls["get_item"]) == CONFIRM_ATTEMPTS
+
+
+def test_confirm_entry_missing():
+    service = make_service(StubTable(get=[{}]))
+    assert service.confirm_entry("gone") is None
+
+
+class StubService:
+    """Stands in for DynamoDBService.save_entries"""
+    
+    def __init__(self, error=None):
+        self.error = error
+        self.batches = []
+    
+    def save_entries(self, entries):
+        self.batches.append([entry.transaction_id for entry in entries])
+        if self.error:
+            raise self.error
+        return entries
+
+
+def test_batcher_coalesces_concurrent_saves():
+    service = StubService()
+    batcher = EntrySaveBatcher(service)
+    entries = [make_entry() for _ in range(3)]
+    
+    async def run():
+        saved = await asyncio.gather(*(batcher.save(entry) for entry in entries))
+        await batcher.close()
+        return saved
+    
+    assert asyncio.run(run()) == entries
+    assert service.batches == [[entry.transaction_id for entry in entries]]
+
+
+def test_batcher_fails_every_save_in_a_failed_batch():
+    service = StubService(error=RuntimeError("throttled"))
+    batcher = EntrySaveBatcher(service)
+    
+    async def run():
+        results = await asyncio.gather(
+            batcher.save(make_entry()), batcher.save(make_entry()), return_exceptions=True
+        )
+        await batcher.close()
+        return results
+    
+    results = asyncio.run(run())
+    assert len(service.batches) == 1
+    assert all(isinstance(result, RuntimeError) and str(result) == "throttled" for result in results)
@@ -0,0 +1,28 @@
+"""Vendor alias matching in the rule-based fallback"""
+import pytest
+from services.reasoning import reasoning_engine
+
+
+@pytest.mark.parametrize("vendor, category", [
+    ("Swiggy", "food"),
+    ("Domino's", "food"),
+    ("Uber India Systems Pvt. Ltd.", "transport"),
+    ("Indian Oil Corporation Ltd", "transport"),
+    ("Reliance Jio Infocomm Limited", "utilities"),
+    ("JIO", "utilities"),
+])
+def test_vendor_alias_matches_the_whole_name(vendor, category):
+    assert reasoning_engine._categorize_by_vendor(vendor) == category
+
+
+@pytest.mark.parametrize("vendor", [
+    "Jio Mart",
+    "JioMart",
+    "Ola Electric",
+    "Uber Eats Café",
+    "Ltd",
+    "",
+    None,
+])
+def test_vendor_alias_ignores_other_names(vendor):
+    assert reasoning_engine._categorize_by_vendor(vendor) is None
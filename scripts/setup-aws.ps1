@@ -60,8 +60,9 @@ Write-Host "📊 Creating DynamoDB table..." -ForegroundColor Yellow
 try {
     aws dynamodb create-table `
         --table-name $TableName `
-        --attribute-definitions AttributeName=transaction_id,AttributeType=S `
+        --attribute-definitions AttributeName=transaction_id,AttributeType=S AttributeName=gsi_pk,AttributeType=S AttributeName=date,AttributeType=S AttributeName=created_at,AttributeType=S `
         --key-schema AttributeName=transaction_id,KeyType=HASH `
+        --global-secondary-indexes "IndexName=date-index,KeySchema=[{AttributeName=gsi_pk,KeyType=HASH},{AttributeName=date,KeyType=RANGE}],Projection={ProjectionType=ALL}" "IndexName=recency-index,KeySchema=[{AttributeName=gsi_pk,KeyType=HASH},{AttributeName=created_at,KeyType=RANGE}],Projection={ProjectionType=ALL}" `
         --billing-mode PAY_PER_REQUEST `
         --region $Region
 } catch {
@@ -49,8 +49,14 @@ aws dynamodb create-table \
     --table-name "$TABLE_NAME" \
     --attribute-definitions \
         AttributeName=transaction_id,AttributeType=S \
+        AttributeName=gsi_pk,AttributeType=S \
+        AttributeName=date,AttributeType=S \
+        AttributeName=created_at,AttributeType=S \
     --key-schema \
         AttributeName=transaction_id,KeyType=HASH \
+    --global-secondary-indexes \
+        'IndexName=date-index,KeySchema=[{AttributeName=gsi_pk,KeyType=HASH},{AttributeName=date,KeyType=RANGE}],Projection={ProjectionType=ALL}' \
+        'IndexName=recency-index,KeySchema=[{AttributeName=gsi_pk,KeyType=HASH},{AttributeName=created_at,KeyType=RANGE}],Projection={ProjectionType=ALL}' \
     --billing-mode PAY_PER_REQUEST \
     --region "$REGION" 2>/dev/null || echo "Table may already exist"
 